@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+from f1_analysis.data_loader import DataLoader
+from f1_analysis.query import ResultsIndex
+from f1_analysis.registry import ENTITY_KINDS
+
+
+class CircuitAggregates:
+    """
+    Agregados por circuito pré-calculados uma única vez sobre todo o histórico.
+
+    Para pilotos e equipes os agregados ficam numa estrutura esparsa e compacta
+    (circuito x entidade): só os pares que existem são guardados, ordenados por
+    circuito, com offsets CSR por circuito. Selecionar um circuito é apenas
+    fatiar esses arrays, sem refazer o join results x races x circuits.
+    """
+
+    _instance = None
+
+    def __init__(self, frame):
+        self._frame = frame
+
+        circuit_ids = frame['circuitId'].to_numpy()
+        race_ids = frame['raceId'].to_numpy()
+        positions = frame['positionOrder'].to_numpy()
+        grid = frame['grid'].to_numpy()
+        points = frame['points'].to_numpy(dtype=float)
+
+        self.circuit_ids, circuit_idx = np.unique(circuit_ids, return_inverse=True)
+        n_circuits = len(self.circuit_ids)
+
+        wins = positions == 1
+        podiums = positions <= 3
+        # grid 0 significa largada do pit lane; fica fora das médias de grid
+        started_on_grid = grid > 0
+        gained = np.where(started_on_grid, grid - positions, 0)
+
+        self._entities = {}
+        for kind, (column, _, _, _) in ENTITY_KINDS.items():
+            entity_values = frame[column].to_numpy()
+            entity_ids, entity_idx = np.unique(entity_values, return_inverse=True)
+
+            # Pares (circuito, entidade) presentes, já ordenados por circuito
+            pair_codes = circuit_idx.astype(np.int64) * len(entity_ids) + entity_idx
+            pairs, pair_idx = np.unique(pair_codes, return_inverse=True)
+            n_pairs = len(pairs)
+            pair_circuit = pairs // len(entity_ids)
+
+            starts = np.bincount(pair_idx, minlength=n_pairs)
+            grid_starts = np.bincount(pair_idx, weights=started_on_grid, minlength=n_pairs)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                avg_grid = np.bincount(pair_idx, weights=np.where(started_on_grid, grid, 0), minlength=n_pairs) / grid_starts
+                avg_gained = np.bincount(pair_idx, weights=gained, minlength=n_pairs) / grid_starts
+
+            self._entities[kind] = {
+                'offsets': np.searchsorted(pair_circuit, np.arange(n_circuits + 1)),
+                'entity_id': entity_ids[pairs % len(entity_ids)],
+                'starts': starts,
+                'wins': np.bincount(pair_idx, weights=wins, minlength=n_pairs).astype(int),
+                'podiums': np.bincount(pair_idx, weights=podiums, minlength=n_pairs).astype(int),
+                'points': np.bincount(pair_idx, weights=points, minlength=n_pairs),
+                'avg_finish': np.bincount(pair_idx, weights=positions, minlength=n_pairs) / starts,
+                'avg_grid': avg_grid,
+                'avg_gained': avg_gained,
+            }
+
+        # Métricas por circuito
+        races_held = np.bincount(np.unique(np.stack([circuit_idx, race_ids]), axis=1)[0], minlength=n_circuits)
+        pole = grid == 1
+        pole_wins = np.bincount(circuit_idx, weights=pole & wins, minlength=n_circuits)
+        poles = np.bincount(circuit_idx, weights=pole, minlength=n_circuits)
+        grid_starts = np.bincount(circuit_idx, weights=started_on_grid, minlength=n_circuits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.circuit_metrics = {
+                'races': races_held,
+                'pole_to_win': pole_wins / poles * 100,
+                'avg_gained': np.bincount(circuit_idx, weights=gained, minlength=n_circuits) / grid_starts,
+                'grid_finish_corr': self._grid_finish_correlation(circuit_idx, n_circuits, grid, positions, started_on_grid),
+            }
+        self.circuit_metrics.update(self._win_concentration(n_circuits))
+
+    @staticmethod
+    def _grid_finish_correlation(circuit_idx, n_circuits, grid, positions, mask):
+        """
+        Correlação de Pearson entre grid e posição final em cada circuito.
+        """
+        idx = circuit_idx[mask]
+        x = grid[mask].astype(float)
+        y = positions[mask].astype(float)
+        n = np.bincount(idx, minlength=n_circuits)
+        sx, sy = np.bincount(idx, x, n_circuits), np.bincount(idx, y, n_circuits)
+        sxx, syy = np.bincount(idx, x * x, n_circuits), np.bincount(idx, y * y, n_circuits)
+        sxy = np.bincount(idx, x * y, n_circuits)
+        cov = n * sxy - sx * sy
+        return cov / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+
+    def _win_concentration(self, n_circuits):
+        """
+        Concentração histórica de vitórias por circuito (índice HHI e fatia do maior vencedor).
+        """
+        drivers = self._entities["driver"]
+        pair_circuit = np.repeat(np.arange(n_circuits), np.diff(drivers['offsets']))
+        wins = drivers['wins'].astype(float)
+        total_wins = np.bincount(pair_circuit, weights=wins, minlength=n_circuits)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            share = wins / total_wins[pair_circuit]
+            top_share = np.zeros(n_circuits)
+            np.maximum.at(top_share, pair_circuit, np.nan_to_num(share))
+            return {
+                'win_hhi': np.bincount(pair_circuit, weights=np.nan_to_num(share) ** 2, minlength=n_circuits),
+                'top_winner_share': top_share * 100,
+                'distinct_winners': np.bincount(pair_circuit, weights=wins > 0, minlength=n_circuits).astype(int),
+            }
+
+    @staticmethod
+    def get():
+        """
+        Retorna os agregados dos dados carregados, calculando-os uma única vez.
+        """
+        frame = ResultsIndex.get().frame
+        instance = CircuitAggregates._instance
+        if instance is None or instance._frame is not frame:
+            instance = CircuitAggregates(frame)
+            CircuitAggregates._instance = instance
+        return instance
+
+    def circuit_table(self):
+        """
+        Retorna um DataFrame com as métricas de cada circuito.
+        """
+        circuits = DataLoader.get_dataframes()["circuits"].set_index('circuitId')
+        metrics = self.circuit_metrics
+        return pd.DataFrame({
+            'circuitId': self.circuit_ids,
+            'Circuito': circuits['name'].reindex(self.circuit_ids).to_numpy(),
+            'Corridas': metrics['races'],
+            'Pole -> Vitória (%)': np.round(metrics['pole_to_win'], 2),
+            'Posições Ganhas em Média': np.round(metrics['avg_gained'], 2),
+            'Correlação Grid x Chegada': np.round(metrics['grid_finish_corr'], 3),
+            'Vencedores Distintos': metrics['distinct_winners'],
+            'Concentração de Vitórias (HHI)': np.round(metrics['win_hhi'], 3),
+            'Maior Vencedor (% das Vitórias)': np.round(metrics['top_winner_share'], 2),
+        })
+
+    def entity_table(self, circuit_id, kind="driver"):
+        """
+        Retorna os resultados de pilotos ('driver') ou equipes ('constructor') num circuito.
+        """
+        if kind not in ENTITY_KINDS:
+            raise ValueError(f"Tipo de entidade inválido: {kind}")
+
+        column, table, name_column, label = ENTITY_KINDS[kind]
+        position = np.searchsorted(self.circuit_ids, circuit_id)
+        if position == len(self.circuit_ids) or self.circuit_ids[position] != circuit_id:
+            raise ValueError(f"Circuito sem resultados: {circuit_id}")
+
+        data = self._entities[kind]
+        start, end = data['offsets'][position], data['offsets'][position + 1]
+        entity_ids = data['entity_id'][start:end]
+        names = DataLoader.get_dataframes()[table].set_index(column)[name_column]
+
+        return pd.DataFrame({
+            label: names.reindex(entity_ids).to_numpy(),
+            'Largadas': data['starts'][start:end],
+            'Vitórias': data['wins'][start:end],
+            'Pódios': data['podiums'][start:end],
+            'Pontos': data['points'][start:end],
+            'Grid Médio': np.round(data['avg_grid'][start:end], 2),
+            'Chegada Média': np.round(data['avg_finish'][start:end], 2),
+            'Posições Ganhas em Média': np.round(data['avg_gained'][start:end], 2),
+        }).sort_values(['Vitórias', 'Pontos'], ascending=False, ignore_index=True)
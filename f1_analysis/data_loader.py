@@ -0,0 +1,194 @@
+import os
+import threading
+
+# "m:ss.sss" (minutos opcionais); valores ausentes no dataset vêm como "\N"
+LAP_TIME_PATTERN = r"^\s*(?:(\d+):)?(\d+)\.(\d{1,3})\s*$"
+
+
+def parse_lap_times(times):
+    """
+    Converte uma Series de tempos "m:ss.sss" em milissegundos inteiros (Int64).
+
+    A conversão é vetorizada via str.extract; tempos ausentes ou inválidos viram <NA>.
+    """
+    parts = times.astype(str).str.extract(LAP_TIME_PATTERN)
+    minutes = parts[0].astype(float).fillna(0)
+    seconds = parts[1].astype(float)
+    millis = parts[2].str.ljust(3, "0").astype(float)
+    return (minutes * 60000 + seconds * 1000 + millis).round().astype("Int64")
+
+
+# Arquivos do dataset carregados (nome da tabela = nome do CSV)
+TABLES = (
+    "drivers", "races", "driver_standings", "constructors", "constructor_standings",
+    "results", "circuits", "status", "qualifying",
+)
+
+# Tabelas com colunas derivadas -> tabelas lidas das quais elas dependem
+DERIVED_FROM = {
+    "results": ("results", "status"),
+    "qualifying": ("qualifying",),
+}
+
+
+class DataLoader:
+    _dataframes = None
+    # Tabelas como lidas do CSV (antes das colunas derivadas) e seus hashes
+    _raw = None
+    _digests = None
+    # Servidores com várias threads podem pedir a carga ao mesmo tempo
+    _lock = threading.Lock()
+
+    @staticmethod
+    def load_data():
+        """
+        Carrega os dados do Kaggle e popula o singleton de DataFrames.
+
+        pandas e kagglehub são importados aqui dentro para que importar este
+        módulo continue leve (o app web e a coleta de testes não pagam o custo).
+        """
+        if DataLoader._dataframes is None:
+            with DataLoader._lock:
+                if DataLoader._dataframes is None:
+                    DataLoader._load(DataLoader._download())
+
+    @staticmethod
+    def reload():
+        """
+        Baixa o snapshot de novo e recarrega só os arquivos cujo hash mudou.
+        """
+        with DataLoader._lock:
+            DataLoader._load(DataLoader._download())
+
+    @staticmethod
+    def _download():
+        from kagglehub import dataset_download
+
+        print("Baixando os dados mais recentes do Kaggle...")
+        base_path = dataset_download("rohanrao/formula-1-world-championship-1950-2020")
+        print(f"Dados baixados no caminho: {base_path}")
+        return base_path
+
+    @staticmethod
+    def _load(base_path):
+        """
+        Lê, valida e deriva as tabelas do diretório baixado.
+
+        Cada CSV tem o hash calculado num passe em streaming. Arquivos com o
+        mesmo hash da carga anterior ou do manifesto já validado não são
+        relidos nem revalidados (vêm da memória ou do cache em pickle); só os
+        alterados passam pelo parse e pelas verificações de integridade.
+
+        Se nenhum hash mudou em relação à carga em memória, nada é refeito e
+        os DataFrames publicados (e os caches que dependem deles) continuam
+        os mesmos objetos; caso contrário só as tabelas derivadas de arquivos
+        alterados são recalculadas.
+        """
+        import pandas as pd
+        from f1_analysis.validation import (
+            DataValidationError, DatasetManifest, check_references, check_row_count, check_table, file_digest,
+        )
+
+        manifest = DatasetManifest()
+        previous_raw = DataLoader._raw or {}
+        previous_digests = DataLoader._digests or {}
+
+        raw, digests, changed = {}, {}, []
+        for table in TABLES:
+            path = os.path.join(base_path, f"{table}.csv")
+            digest = file_digest(path)
+            digests[table] = digest
+
+            if previous_digests.get(table) == digest:
+                raw[table] = previous_raw[table]
+            elif manifest.is_verified(table, digest):
+                raw[table] = pd.read_pickle(manifest.frame_path(table, digest))
+            else:
+                raw[table] = pd.read_csv(path)
+                changed.append(table)
+
+        # Tabelas diferentes das que estão em memória (lidas do CSV ou do cache)
+        stale = {table for table in TABLES if previous_digests.get(table) != digests[table]}
+        if not stale and DataLoader._dataframes is not None:
+            print("Nenhum arquivo alterado; dados em memória mantidos.")
+            return
+
+        if changed:
+            print("Validando arquivos alterados:", changed)
+            problems, warnings = [], []
+            for table in changed:
+                problems.extend(check_table(table, raw[table]))
+                warnings.extend(check_row_count(table, raw[table], manifest.previous_rows(table)))
+            for warning in warnings:
+                print("Aviso:", warning)
+            problems.extend(check_references(raw, changed))
+            if problems:
+                raise DataValidationError("Dataset inválido:\n- " + "\n- ".join(problems))
+
+            for table in changed:
+                path = os.path.join(base_path, f"{table}.csv")
+                manifest.record(table, digests[table], os.path.getsize(path), raw[table])
+            manifest.save()
+        else:
+            print("Nenhum arquivo alterado; validação dispensada.")
+
+        dataframes = DataLoader._derive(raw, DataLoader._dataframes, stale)
+
+        # Só publica o novo estado depois de completo: quem lê _dataframes
+        # (is_loaded, get_dataframes) nunca vê um dicionário pela metade, e
+        # uma falha no meio da carga mantém o estado anterior intacto
+        DataLoader._raw = raw
+        DataLoader._digests = digests
+        DataLoader._dataframes = dataframes
+        print("Dados carregados com sucesso:", list(dataframes.keys()))
+
+    @staticmethod
+    def _derive(raw, previous=None, stale=TABLES):
+        """
+        Monta os DataFrames de trabalho, com as colunas derivadas, a partir das tabelas lidas.
+
+        Tabelas derivadas cujas dependências não estão em 'stale' são
+        reaproveitadas de 'previous' (a carga anterior) sem recálculo.
+        """
+        from f1_analysis.reliability import classify_status, status_category_lookup
+
+        dataframes = dict(raw)
+        rebuild = {
+            table for table, sources in DERIVED_FROM.items()
+            if previous is None or not set(stale).isdisjoint(sources)
+        }
+        for table in DERIVED_FROM.keys() - rebuild:
+            dataframes[table] = previous[table]
+
+        # Status: cada resultado recebe a categoria via lookup statusId -> categoria
+        if "results" in rebuild:
+            results = raw["results"].copy()
+            results["statusCategory"] = classify_status(
+                results["statusId"].to_numpy(), status_category_lookup(raw["status"])
+            )
+            dataframes["results"] = results
+
+        # Qualificação: tempos "m:ss.sss" convertidos para milissegundos
+        if "qualifying" in rebuild:
+            qualifying = raw["qualifying"].copy()
+            for session in ("q1", "q2", "q3"):
+                qualifying[f"{session}_ms"] = parse_lap_times(qualifying[session])
+            qualifying["best_ms"] = qualifying[["q1_ms", "q2_ms", "q3_ms"]].min(axis=1)
+            dataframes["qualifying"] = qualifying
+        return dataframes
+
+    @staticmethod
+    def is_loaded():
+        """
+        Indica se os dados já foram carregados por completo.
+        """
+        return DataLoader._dataframes is not None
+
+    @staticmethod
+    def get_dataframes():
+        """
+        Retorna os DataFrames carregados.
+        """
+        if DataLoader._dataframes is None:
+            raise ValueError("Os dados não foram carregados. Execute 'load_data()' primeiro.")
+        return DataLoader._dataframes
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+from f1_analysis.data_loader import DataLoader
+from f1_analysis.query import ResultsIndex
+from f1_analysis.registry import ENTITY_KINDS, EntityRegistry, MetricTable
+
+DEFAULT_WINDOW = 5
+# Maior janela aceita pelo dashboard (validada também no servidor)
+MAX_WINDOW = 50
+DEFAULT_ALPHA = 0.3
+
+# Colunas de métricas de forma geradas por RollingForm
+ROLLING_POINTS = 'Pontos na Janela'
+ROLLING_PODIUM_RATE = 'Pódios na Janela (%)'
+EWM_FINISH = 'Chegada (Média Exponencial)'
+FORM_METRICS = (ROLLING_POINTS, ROLLING_PODIUM_RATE, EWM_FINISH)
+
+
+def rolling_sum(values, group_starts, window):
+    """
+    Soma móvel das últimas 'window' corridas de cada entidade via soma acumulada.
+
+    'group_starts' diz, para cada posição, onde começa o bloco da entidade; a
+    janela nunca atravessa esse limite. Cada janela custa duas leituras da
+    soma acumulada, sem recalcular a soma.
+    Retorna (somas, tamanho efetivo de cada janela).
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    positions = np.arange(len(values))
+    window_start = np.maximum(positions - window + 1, group_starts)
+    return cumulative[positions + 1] - cumulative[window_start], positions + 1 - window_start
+
+
+def exponential_average(values, starts, lengths, alpha):
+    """
+    Média móvel exponencial por entidade (equivale a ewm(alpha, adjust=False)).
+
+    A recorrência avança um passo por vez em todas as entidades ao mesmo
+    tempo: o laço é sobre a posição dentro do bloco, não sobre as entidades.
+    """
+    values = np.asarray(values, dtype=float)
+    averages = np.empty_like(values)
+    averages[starts] = values[starts]
+    for step in range(1, int(lengths.max(initial=0))):
+        active = starts[lengths > step] + step
+        averages[active] = alpha * values[active] + (1 - alpha) * averages[active - 1]
+    return averages
+
+
+class RollingForm:
+    """
+    Métricas de forma (pontos nas últimas N corridas, taxa de pódios móvel e
+    posição final com média exponencial) para toda a linha do tempo.
+
+    Os resultados são agregados por (entidade, corrida), ordenados pela ordem
+    cronológica das corridas e guardados em blocos contíguos por entidade; as
+    janelas são calculadas sobre esses arrays de uma vez só. O resultado fica
+    em cache por (tipo, janela, alpha).
+    """
+
+    _cache = {}
+    _frame = None
+
+    @staticmethod
+    def get(kind="driver", window=DEFAULT_WINDOW, alpha=DEFAULT_ALPHA):
+        """
+        Retorna o DataFrame de forma de pilotos ('driver') ou equipes ('constructor').
+        """
+        if kind not in ENTITY_KINDS:
+            raise ValueError(f"Tipo de entidade inválido: {kind}")
+        if window < 1 or not 0 < alpha <= 1:
+            raise ValueError("A janela deve ser >= 1 e alpha deve estar em (0, 1].")
+
+        frame = ResultsIndex.get().frame
+        if RollingForm._frame is not frame:
+            RollingForm._cache = {}
+            RollingForm._frame = frame
+
+        key = (kind, int(window), float(alpha))
+        if key not in RollingForm._cache:
+            RollingForm._cache[key] = RollingForm._compute(frame, kind, int(window), float(alpha))
+        return RollingForm._cache[key]
+
+    @staticmethod
+    def _compute(frame, kind, window, alpha):
+        column, table, name_column, _ = ENTITY_KINDS[kind]
+        dataframes = DataLoader.get_dataframes()
+        races = dataframes["races"]
+
+        # Ordem cronológica das corridas
+        races = races.sort_values(['year', 'round'])
+        race_order = pd.Series(np.arange(len(races)), index=races['raceId'].to_numpy())
+        sequence = race_order.reindex(frame['raceId'].to_numpy()).to_numpy()
+
+        entity_ids = frame[column].to_numpy()
+        order = np.lexsort((sequence, entity_ids))
+        entity_ids = entity_ids[order]
+        sequence = sequence[order]
+        points = frame['points'].to_numpy(dtype=float)[order]
+        positions = frame['positionOrder'].to_numpy()[order]
+
+        # Uma linha por (entidade, corrida): soma de pontos, pódio e melhor chegada
+        new_pair = np.ones(len(order), dtype=bool)
+        new_pair[1:] = (entity_ids[1:] != entity_ids[:-1]) | (sequence[1:] != sequence[:-1])
+        pair_starts = np.flatnonzero(new_pair)
+        pair_entities = entity_ids[pair_starts]
+        pair_sequence = sequence[pair_starts]
+        pair_points = np.add.reduceat(points, pair_starts) if len(order) else points
+        pair_finish = np.minimum.reduceat(positions, pair_starts) if len(order) else positions
+        pair_podium = (pair_finish <= 3).astype(float)
+
+        # Blocos contíguos por entidade (offsets CSR)
+        new_entity = np.ones(len(pair_starts), dtype=bool)
+        new_entity[1:] = pair_entities[1:] != pair_entities[:-1]
+        starts = np.flatnonzero(new_entity)
+        lengths = np.diff(np.append(starts, len(pair_starts)))
+        group_starts = np.repeat(starts, lengths)
+
+        rolling_points, window_sizes = rolling_sum(pair_points, group_starts, window)
+        rolling_podiums, _ = rolling_sum(pair_podium, group_starts, window)
+        ewm_finish = exponential_average(pair_finish, starts, lengths, alpha)
+
+        race_rows = races.iloc[pair_sequence]
+        names = dataframes[table].set_index(column)[name_column]
+        return pd.DataFrame({
+            column: pair_entities,
+            'Nome': names.reindex(pair_entities).to_numpy(),
+            'raceId': race_rows['raceId'].to_numpy(),
+            'Ano': race_rows['year'].to_numpy(),
+            'Rodada': race_rows['round'].to_numpy(),
+            'Data': pd.to_datetime(race_rows['date'].to_numpy()),
+            'Pontos': pair_points,
+            'Chegada': pair_finish,
+            ROLLING_POINTS: rolling_points,
+            ROLLING_PODIUM_RATE: rolling_podiums / window_sizes * 100,
+            EWM_FINISH: ewm_finish,
+        })
+
+
+def top_entities(kind="driver", n=5):
+    """
+    Retorna os ids das n entidades com mais pontos na temporada mais recente.
+    """
+    column = ENTITY_KINDS[kind][0]
+    index = ResultsIndex.get()
+    last_season = index.frame['year'].max()
+    season = index.select(year=last_season)
+    totals = MetricTable(EntityRegistry.get(kind), season[column].to_numpy())
+    totals['Pontos'] = totals.sum(season['points'].to_numpy())
+    return totals.rank('Pontos', top=n).ids.tolist()
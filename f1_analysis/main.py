@@ -1,47 +1,17 @@
-import os
-
 import numpy as np
-import pandas as pd
-from kagglehub import dataset_download
-
 
-class DataLoader:
-    _dataframes = None
-
-    @staticmethod
-    def load_data():
-        """
-        Carrega os dados do Kaggle e popula o singleton de DataFrames.
-        """
-        if DataLoader._dataframes is None:
-            DataLoader._dataframes = {}
-            print("Baixando os dados mais recentes do Kaggle...")
-            base_path = dataset_download("rohanrao/formula-1-world-championship-1950-2020")
-            print(f"Dados baixados no caminho: {base_path}")
-
-            # Carregar os arquivos CSV
-            DataLoader._dataframes["drivers"] = pd.read_csv(os.path.join(base_path, "drivers.csv"))
-            DataLoader._dataframes["races"] = pd.read_csv(os.path.join(base_path, "races.csv"))
-            DataLoader._dataframes["driver_standings"] = pd.read_csv(os.path.join(base_path, "driver_standings.csv"))
-            DataLoader._dataframes["constructors"] = pd.read_csv(os.path.join(base_path, "constructors.csv"))
-            DataLoader._dataframes["constructor_standings"] = pd.read_csv(os.path.join(base_path, "constructor_standings.csv"))
-            DataLoader._dataframes["results"] = pd.read_csv(os.path.join(base_path, "results.csv"))
-            print("Dados carregados com sucesso:", list(DataLoader._dataframes.keys()))
-
-    @staticmethod
-    def get_dataframes():
-        """
-        Retorna os DataFrames carregados.
-        """
-        if DataLoader._dataframes is None:
-            raise ValueError("Os dados não foram carregados. Execute 'load_data()' primeiro.")
-        return DataLoader._dataframes
+from f1_analysis.data_loader import DataLoader
+from f1_analysis.query import ResultsIndex
+from f1_analysis.registry import EntityRegistry, MetricTable
+from f1_analysis.reliability import is_classified
 
 
 def analyze_drivers():
     """
     Realiza uma análise detalhada dos pilotos com várias métricas.
     """
+    import matplotlib.pyplot as plt
+
     print("\nAnálise de Pilotos")
 
     try:
@@ -59,70 +29,34 @@ def analyze_drivers():
         print("Erro: Faltando um ou mais arquivos necessários para a análise.")
         return
 
-    # Relacionar 'results' com 'races' para obter o ano
-    results_with_year = results.merge(races[['raceId', 'year', 'name']], on='raceId')
-
-    # Filtrar para os anos recentes (2022-2024)
-    recent_years = results_with_year.query("2022 <= year <= 2024")
+    # Filtrar para os anos recentes (2022-2024) pelo índice e trazer o nome da corrida
+    recent_years = ResultsIndex.get().select(year=(2022, 2024))
+    recent_years = recent_years.merge(races[['raceId', 'name']], on='raceId')
 
     # Converter os dados para NumPy arrays
     driver_ids = recent_years['driverId'].values
-    race_ids = recent_years['raceId'].values
     points = recent_years['points'].values
     positions = recent_years['positionOrder'].values
 
-    # Usar NumPy para métricas básicas
-    unique_drivers = np.unique(driver_ids)
-
-    metrics = {}
-    for driver in unique_drivers:
-        driver_points = points[driver_ids == driver]
-        driver_positions = positions[driver_ids == driver]
-        driver_race_ids = race_ids[driver_ids == driver]
+    # Métricas em colunas, uma linha por piloto (índices densos do registro)
+    metrics = MetricTable(EntityRegistry.get("driver"), driver_ids)
+    total_races = metrics.count()
 
-        # Total de pontos
-        total_points = np.sum(driver_points)
+    # Detalhamento de vitórias
+    winners = recent_years[recent_years['positionOrder'] == 1]
+    win_race_names = winners.groupby('driverId')['name'].agg(list).reindex(metrics.ids)
 
-        # Número de vitórias
-        total_wins = np.sum(driver_positions == 1)
+    metrics['Piloto'] = drivers.set_index('driverId')['surname'].reindex(metrics.ids).to_numpy()
+    metrics['Pontos Totais'] = metrics.sum(points)
+    metrics['Vitórias Totais'] = metrics.count(where=positions == 1)
+    metrics['Corridas Disputadas'] = total_races
+    metrics['Taxa de Vitórias (%)'] = (metrics['Vitórias Totais'] / total_races) * 100
+    metrics['Média de Pontos por Corrida'] = metrics['Pontos Totais'] / total_races
+    metrics['Melhor Posição'] = metrics.min(positions)
+    metrics['Corridas Vencidas'] = [names if isinstance(names, list) else [] for names in win_race_names]
 
-        # Número de corridas disputadas
-        total_races = len(driver_points)
-
-        # Taxa de vitórias
-        win_rate = (total_wins / total_races) * 100 if total_races > 0 else 0
-
-        # Média de pontos por corrida
-        avg_points_per_race = total_points / total_races if total_races > 0 else 0
-
-        # Melhores posições
-        best_positions = np.min(driver_positions)
-
-        # Detalhamento de vitórias
-        win_race_names = recent_years[(recent_years['driverId'] == driver) & (recent_years['positionOrder'] == 1)]['name'].tolist()
-
-        metrics[driver] = {
-            'Pontos Totais': total_points,
-            'Vitórias Totais': total_wins,
-            'Corridas Disputadas': total_races,
-            'Taxa de Vitórias (%)': win_rate,
-            'Média de Pontos por Corrida': avg_points_per_race,
-            'Melhor Posição': best_positions,
-            'Corridas Vencidas': win_race_names
-        }
-
-    # Ordenar os pilotos por pontos totais
-    metrics_sorted = sorted(metrics.items(), key=lambda x: x[1]['Pontos Totais'], reverse=True)
-
-    # Criar DataFrame para exibição
-    rows = []
-    for driver, data in metrics_sorted:
-        driver_name = drivers.set_index('driverId').loc[driver, 'surname']
-        rows.append({
-            'Piloto': driver_name,
-            **data
-        })
-    metrics_df = pd.DataFrame(rows)
+    # Ordenar os pilotos por pontos totais e criar DataFrame para exibição
+    metrics_df = metrics.rank('Pontos Totais').to_frame()
 
     # Exibir DataFrame
     print("\nResumo Estatístico dos Pilotos (2022-2024):")
@@ -162,6 +96,8 @@ def analyze_teams():
     """
     Realiza análise de desempenho por equipe (2022-2024).
     """
+    import matplotlib.pyplot as plt
+
     print("\nAnálise de Desempenho das Equipes (2022-2024)")
 
     try:
@@ -180,12 +116,9 @@ def analyze_teams():
         print("Erro: Faltando um ou mais arquivos necessários para a análise.")
         return
 
-    # Relacionar 'results' com 'races' e 'constructors' para obter o ano
-    results_with_year = results.merge(races[['raceId', 'year']], on='raceId')
-    results_with_year = results_with_year.merge(constructors[['constructorId', 'name']], on='constructorId')
-
-    # Filtrar para os anos recentes (2022-2024)
-    recent_years = results_with_year.query("2022 <= year <= 2024")
+    # Filtrar para os anos recentes (2022-2024) pelo índice e relacionar com 'constructors'
+    recent_years = ResultsIndex.get().select(year=(2022, 2024))
+    recent_years = recent_years.merge(constructors[['constructorId', 'name']], on='constructorId')
 
     # Converter os dados para NumPy arrays
     constructor_ids = recent_years['constructorId'].values
@@ -194,49 +127,18 @@ def analyze_teams():
     race_ids = recent_years['raceId'].values
     constructor_names = recent_years['name'].values
 
-    # Usar NumPy para métricas básicas
-    unique_constructors = np.unique(constructor_ids)
-
-    team_metrics = {}
-    for constructor in unique_constructors:
-        team_points = points[constructor_ids == constructor]
-        team_positions = positions[constructor_ids == constructor]
-        team_race_ids = race_ids[constructor_ids == constructor]
+    # Métricas em colunas, uma linha por equipe (índices densos do registro)
+    team_metrics = MetricTable(EntityRegistry.get("constructor"), constructor_ids)
+    team_metrics['Equipe'] = team_metrics.first(constructor_names)
+    team_metrics['Pontos Totais'] = team_metrics.sum(points)
+    team_metrics['Vitórias Totais'] = team_metrics.count(where=positions == 1)
+    team_metrics['Pódios Totais'] = team_metrics.count(where=(positions >= 1) & (positions <= 3))
+    team_metrics['Corridas Disputadas'] = team_metrics.nunique(race_ids)
+    team_metrics['Média de Pontos por Corrida'] = team_metrics['Pontos Totais'] / team_metrics['Corridas Disputadas']
+    team_metrics['Melhor Resultado'] = team_metrics.min(positions)
 
-        # Total de pontos
-        total_points = np.sum(team_points)
-
-        # Número de vitórias
-        total_wins = np.sum(team_positions == 1)
-
-        # Número de pódios
-        total_podiums = np.sum((team_positions >= 1) & (team_positions <= 3))
-
-        # Número de corridas disputadas
-        total_races = len(np.unique(team_race_ids))
-
-        # Média de pontos por corrida
-        avg_points_per_race = total_points / total_races if total_races > 0 else 0
-
-        # Melhor resultado
-        best_result = np.min(team_positions)
-
-        team_metrics[constructor] = {
-            'Equipe': constructor_names[constructor_ids == constructor][0],
-            'Pontos Totais': total_points,
-            'Vitórias Totais': total_wins,
-            'Pódios Totais': total_podiums,
-            'Corridas Disputadas': total_races,
-            'Média de Pontos por Corrida': avg_points_per_race,
-            'Melhor Resultado': best_result
-        }
-
-    # Ordenar as equipes por pontos totais
-    team_metrics_sorted = sorted(team_metrics.items(), key=lambda x: x[1]['Pontos Totais'], reverse=True)
-
-    # Criar DataFrame para exibição
-    rows = [data for _, data in team_metrics_sorted]
-    team_metrics_df = pd.DataFrame(rows)
+    # Ordenar as equipes por pontos totais e criar DataFrame para exibição
+    team_metrics_df = team_metrics.rank('Pontos Totais').to_frame()
 
     # Exibir DataFrame
     print("\nResumo Estatístico das Equipes (2022-2024):")
@@ -272,10 +174,15 @@ def analyze_teams():
     plt.grid(axis='y')
     plt.show()
 
-def enhanced_best_drivers_analysis():
+def enhanced_best_drivers_analysis(exclude_dnf=False):
         """
         Determina os melhores pilotos considerando o desempenho da equipe e dados de classificação.
+
+        Com exclude_dnf=True as posições ganhas só consideram chegadas classificadas,
+        para que abandonos não contem como uma posição final ruim.
         """
+        import matplotlib.pyplot as plt
+
         print("\nAnálise Avançada dos Melhores Pilotos (2022-2024)")
 
         try:
@@ -294,12 +201,9 @@ def enhanced_best_drivers_analysis():
             print("Erro: Faltando um ou mais arquivos necessários para a análise.")
             return
 
-        # Relacionar 'results' com 'races' e 'constructors' para obter o ano
-        results_with_year = results.merge(races[['raceId', 'year']], on='raceId')
-        results_with_year = results_with_year.merge(constructors[['constructorId', 'name']], on='constructorId')
-
-        # Filtrar para os anos recentes (2022-2024)
-        recent_years = results_with_year.query("2022 <= year <= 2024")
+        # Filtrar para os anos recentes (2022-2024) pelo índice e relacionar com 'constructors'
+        recent_years = ResultsIndex.get().select(year=(2022, 2024))
+        recent_years = recent_years.merge(constructors[['constructorId', 'name']], on='constructorId')
 
         # Converter os dados para NumPy arrays
         driver_ids = recent_years['driverId'].values
@@ -308,72 +212,57 @@ def enhanced_best_drivers_analysis():
         positions = recent_years['positionOrder'].values
         grid_positions = recent_years['grid'].values  # Dados de classificação
 
-        # Métricas de Equipe
-        unique_constructors = np.unique(constructor_ids)
-        team_metrics = {}
-        for constructor in unique_constructors:
-            team_points = points[constructor_ids == constructor]
-            team_positions = positions[constructor_ids == constructor]
-
-            total_points = np.sum(team_points)
-            total_wins = np.sum(team_positions == 1)
-            total_races = len(np.unique(recent_years[constructor_ids == constructor]['raceId'].values))
-            avg_points_per_race = total_points / total_races if total_races > 0 else 0
+        # Resultados considerados nas posições ganhas
+        if exclude_dnf:
+            counted = is_classified(recent_years['statusCategory'].values)
+        else:
+            counted = np.ones(len(recent_years), dtype=bool)
 
-            team_metrics[constructor] = {
-                'Competitividade': (total_points * 0.5 + total_wins * 30 + avg_points_per_race * 10)
-            }
+        # Métricas de Equipe
+        team_metrics = MetricTable(EntityRegistry.get("constructor"), constructor_ids)
+        team_points = team_metrics.sum(points)
+        team_wins = team_metrics.count(where=positions == 1)
+        team_avg_points = team_points / team_metrics.nunique(recent_years['raceId'].values)
+        team_metrics['Competitividade'] = team_points * 0.5 + team_wins * 30 + team_avg_points * 10
 
         # Métricas de Pilotos
-        unique_drivers = np.unique(driver_ids)
-        metrics = {}
-        for driver in unique_drivers:
-            driver_points = points[driver_ids == driver]
-            driver_positions = positions[driver_ids == driver]
-            driver_grid_positions = grid_positions[driver_ids == driver]
-            driver_constructor = recent_years[recent_years['driverId'] == driver]['constructorId'].iloc[0]
-
-            total_points = np.sum(driver_points)
-            total_wins = np.sum(driver_positions == 1)
-            total_races = len(driver_points)
-            avg_points_per_race = total_points / total_races if total_races > 0 else 0
-            win_rate = (total_wins / total_races) * 100 if total_races > 0 else 0
-            avg_grid_position = np.mean(driver_grid_positions)
-            avg_finish_position = np.mean(driver_positions)
-            positions_gained = avg_grid_position - avg_finish_position
-
-            # Ajuste pelo desempenho da equipe
-            team_competitiveness = team_metrics[driver_constructor]['Competitividade']
-            performance_score = (
-                    (total_points * 0.5) +
-                    (total_wins * 30) +
-                    (avg_points_per_race * 10) +
-                    (positions_gained * 5) +
-                    (team_competitiveness * 0.2)
+        metrics = MetricTable(EntityRegistry.get("driver"), driver_ids)
+        total_points = metrics.sum(points)
+        total_wins = metrics.count(where=positions == 1)
+        total_races = metrics.count()
+        avg_points_per_race = total_points / total_races
+        win_rate = (total_wins / total_races) * 100
+
+        counted_races = metrics.count(where=counted)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            positions_gained = np.where(
+                counted_races > 0,
+                metrics.sum(grid_positions, where=counted) / counted_races
+                - metrics.sum(positions, where=counted) / counted_races,
+                0
             )
 
-            metrics[driver] = {
-                'Pontos Totais': total_points,
-                'Vitórias Totais': total_wins,
-                'Corridas Disputadas': total_races,
-                'Taxa de Vitórias (%)': win_rate,
-                'Média de Pontos por Corrida': avg_points_per_race,
-                'Posições Ganhas em Média': positions_gained,
-                'Índice de Desempenho Ajustado': performance_score
-            }
-
-        # Ordenar os pilotos por índice de desempenho ajustado
-        metrics_sorted = sorted(metrics.items(), key=lambda x: x[1]['Índice de Desempenho Ajustado'], reverse=True)
-
-        # Criar DataFrame para exibição
-        rows = []
-        for driver, data in metrics_sorted:
-            driver_name = drivers.set_index('driverId').loc[driver, 'surname']
-            rows.append({
-                'Piloto': driver_name,
-                **data
-            })
-        metrics_df = pd.DataFrame(rows)
+        # Ajuste pelo desempenho da equipe (equipe da primeira corrida do piloto)
+        driver_constructors = metrics.first(constructor_ids)
+        team_competitiveness = team_metrics['Competitividade'][team_metrics.rows_of(driver_constructors)]
+
+        metrics['Piloto'] = drivers.set_index('driverId')['surname'].reindex(metrics.ids).to_numpy()
+        metrics['Pontos Totais'] = total_points
+        metrics['Vitórias Totais'] = total_wins
+        metrics['Corridas Disputadas'] = total_races
+        metrics['Taxa de Vitórias (%)'] = win_rate
+        metrics['Média de Pontos por Corrida'] = avg_points_per_race
+        metrics['Posições Ganhas em Média'] = positions_gained
+        metrics['Índice de Desempenho Ajustado'] = (
+                (total_points * 0.5) +
+                (total_wins * 30) +
+                (avg_points_per_race * 10) +
+                (positions_gained * 5) +
+                (team_competitiveness * 0.2)
+        )
+
+        # Ordenar os pilotos por índice de desempenho ajustado e criar DataFrame para exibição
+        metrics_df = metrics.rank('Índice de Desempenho Ajustado').to_frame()
 
         # Exibir DataFrame
         print("\nMelhores Pilotos Ajustados (2022-2024):")
@@ -389,16 +278,14 @@ def enhanced_best_drivers_analysis():
         plt.grid(axis='y')
         plt.show()
 
-import tkinter as tk
-from tkinter import messagebox
-import matplotlib.pyplot as plt
-
 
 class F1AnalysisApp:
     def __init__(self, root):
         """
         Inicializa a interface gráfica principal.
         """
+        import tkinter as tk
+
         self.root = root
         self.root.title("F1 Analysis Dashboard")
         self.root.geometry("400x300")
@@ -424,6 +311,8 @@ class F1AnalysisApp:
         """
         Chama a análise de pilotos e exibe os resultados.
         """
+        from tkinter import messagebox
+
         try:
             analyze_drivers()  # Função já definida no código original
             messagebox.showinfo("Sucesso", "Análise de Pilotos concluída!")
@@ -434,6 +323,8 @@ class F1AnalysisApp:
         """
         Chama a análise de equipes e exibe os resultados.
         """
+        from tkinter import messagebox
+
         try:
             analyze_teams()  # Função já definida no código original
             messagebox.showinfo("Sucesso", "Análise de Equipes concluída!")
@@ -444,6 +335,8 @@ class F1AnalysisApp:
         """
         Chama a análise avançada de pilotos e exibe os resultados.
         """
+        from tkinter import messagebox
+
         try:
             enhanced_best_drivers_analysis()  # Função já definida no código original
             messagebox.showinfo("Sucesso", "Análise Avançada concluída!")
@@ -457,6 +350,8 @@ if __name__ == "__main__":
     DataLoader.load_data()
 
     # Inicializar a aplicação Tkinter
+    import tkinter as tk
+
     root = tk.Tk()
     app = F1AnalysisApp(root)
     root.mainloop()
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+
+from f1_analysis.data_loader import DataLoader
+
+
+# Colunas com os tempos de cada sessão em milissegundos (Q1, Q2, Q3)
+SESSIONS = ("q1_ms", "q2_ms", "q3_ms")
+
+
+class QualifyingEntries:
+    """
+    Tabela de entradas de classificação x corrida calculada uma única vez.
+
+    O resultado fica em cache enquanto as tabelas carregadas forem as mesmas
+    (mesmos objetos), como em CircuitAggregates e RollingForm.
+    """
+
+    _frames = None
+    _entries = None
+
+    @staticmethod
+    def get():
+        """
+        Retorna as entradas dos dados carregados, calculando-as uma única vez.
+        """
+        dataframes = DataLoader.get_dataframes()
+        frames = (dataframes["qualifying"], dataframes["races"], dataframes["results"])
+        cached = QualifyingEntries._frames
+        if cached is None or any(frame is not old for frame, old in zip(frames, cached)):
+            QualifyingEntries._entries = QualifyingEntries._compute(*frames)
+            QualifyingEntries._frames = frames
+        return QualifyingEntries._entries
+
+    @staticmethod
+    def _compute(qualifying, races, results):
+        entries = qualifying[['raceId', 'driverId', 'constructorId', 'position', *SESSIONS]].merge(
+            races[['raceId', 'year']], on='raceId'
+        )
+        times = np.column_stack([entries[session].to_numpy(dtype=float, na_value=np.nan) for session in SESSIONS])
+        has_time = ~np.isnan(times)
+        rows = np.arange(len(entries))
+
+        # Última sessão em que o piloto marcou tempo (-1 = nenhuma)
+        last_session = np.where(
+            has_time.any(axis=1), len(SESSIONS) - 1 - np.argmax(has_time[:, ::-1], axis=1), -1
+        )
+        lap_ms = np.where(last_session >= 0, times[rows, np.maximum(last_session, 0)], np.nan)
+
+        # Gap para a pole: a volta da última sessão do piloto contra a mais
+        # rápida da mesma sessão, para não comparar pistas em condições diferentes
+        session_fastest = pd.DataFrame(times).groupby(entries['raceId'].to_numpy()).transform('min').to_numpy()
+        fastest_ms = np.where(last_session >= 0, session_fastest[rows, np.maximum(last_session, 0)], np.nan)
+        entries['gap_to_pole_ms'] = lap_ms - fastest_ms
+        entries['gap_to_pole_pct'] = entries['gap_to_pole_ms'] / fastest_ms * 100
+
+        # Delta para o companheiro: na última sessão em que os dois marcaram
+        # tempo, só quando a equipe tem exatamente dois carros na corrida
+        team_keys = [entries['raceId'].to_numpy(), entries['constructorId'].to_numpy()]
+        team = pd.DataFrame(times).groupby(team_keys)
+        team_size = entries.groupby(['raceId', 'constructorId'])['driverId'].transform('size').to_numpy()
+        team_counts = team.transform('count').to_numpy()
+        team_sums = team.transform('sum').to_numpy()
+        teammate_delta = np.full(len(entries), np.nan)
+        for session in reversed(range(len(SESSIONS))):
+            common = (team_size == 2) & (team_counts[:, session] == 2) & np.isnan(teammate_delta)
+            own = times[:, session]
+            teammate_delta = np.where(common, own - (team_sums[:, session] - own), teammate_delta)
+        entries['teammate_delta_ms'] = teammate_delta
+
+        # Conversão classificação -> corrida
+        entries = entries.merge(
+            results[['raceId', 'driverId', 'positionOrder', 'points']], on=['raceId', 'driverId'], how='left'
+        )
+        entries['positions_gained'] = entries['position'] - entries['positionOrder']
+        return entries
+
+
+def qualifying_entries():
+    """
+    Uma linha por piloto e corrida com o gap para a pole, o delta para o
+    companheiro de equipe e o resultado da corrida.
+
+    Tudo é calculado de uma vez para todas as temporadas com transformações
+    por grupo (corrida, corrida x equipe), sem laços por piloto; o resultado
+    vem do cache de QualifyingEntries e não deve ser alterado.
+    """
+    return QualifyingEntries.get()
+
+
+def qualifying_season_metrics(year=None):
+    """
+    Agrega as métricas de classificação x corrida por piloto e temporada.
+    """
+    drivers = DataLoader.get_dataframes()["drivers"]
+    entries = qualifying_entries()
+    if year is not None:
+        entries = entries[entries['year'] == year]
+
+    pole = entries['position'] == 1
+    top_10 = entries['position'] <= 10
+    has_teammate = entries['teammate_delta_ms'].notna()
+    entries = entries.assign(
+        pole=pole,
+        pole_win=pole & (entries['positionOrder'] == 1),
+        top_10=top_10,
+        top_10_points=top_10 & (entries['points'] > 0),
+        has_teammate=has_teammate,
+        beat_teammate=has_teammate & (entries['teammate_delta_ms'] < 0),
+    )
+
+    grouped = entries.groupby(['year', 'driverId']).agg(
+        sessions=('position', 'size'),
+        poles=('pole', 'sum'),
+        pole_wins=('pole_win', 'sum'),
+        top_10=('top_10', 'sum'),
+        top_10_points=('top_10_points', 'sum'),
+        avg_position=('position', 'mean'),
+        avg_gap_ms=('gap_to_pole_ms', 'mean'),
+        median_gap_pct=('gap_to_pole_pct', 'median'),
+        teammate_delta_ms=('teammate_delta_ms', 'median'),
+        teammate_sessions=('has_teammate', 'sum'),
+        beat_teammate=('beat_teammate', 'sum'),
+        positions_gained=('positions_gained', 'mean'),
+    ).reset_index()
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pole_conversion = grouped['pole_wins'] / grouped['poles'] * 100
+        top_10_conversion = grouped['top_10_points'] / grouped['top_10'] * 100
+        teammate_rate = grouped['beat_teammate'] / grouped['teammate_sessions'] * 100
+
+    metrics_df = pd.DataFrame({
+        'Ano': grouped['year'],
+        'Piloto': grouped['driverId'].map(drivers.set_index('driverId')['surname']),
+        'Classificações': grouped['sessions'],
+        'Poles': grouped['poles'],
+        'Posição Média na Classificação': grouped['avg_position'].round(2),
+        'Gap Médio para a Pole (ms)': grouped['avg_gap_ms'].round(0),
+        'Gap Mediano para a Pole (%)': grouped['median_gap_pct'].round(3),
+        'Delta Mediano p/ Companheiro (ms)': grouped['teammate_delta_ms'].round(0),
+        'À Frente do Companheiro (%)': teammate_rate.round(2),
+        'Posições Ganhas na Corrida': grouped['positions_gained'].round(2),
+        'Pole -> Vitória (%)': pole_conversion.round(2),
+        'Top 10 -> Pontos (%)': top_10_conversion.round(2),
+    })
+    return metrics_df.sort_values(['Ano', 'Gap Mediano para a Pole (%)'], ascending=[False, True], ignore_index=True)
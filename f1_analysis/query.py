@@ -0,0 +1,121 @@
+import numpy as np
+
+from f1_analysis.data_loader import DataLoader
+
+# Chaves indexadas sobre a tabela de resultados (year e circuitId vêm de races)
+INDEXED_KEYS = ("year", "raceId", "driverId", "constructorId", "circuitId")
+
+
+class ResultsIndex:
+    """
+    Camada de consulta em memória sobre 'results' com índices ordenados.
+
+    Para cada chave guardamos a permutação que ordena a coluna, os valores
+    únicos e os offsets no estilo CSR: as linhas com o k-ésimo valor ficam em
+    order[offsets[k]:offsets[k + 1]]. Uma consulta é resolvida fatiando o
+    índice mais seletivo e filtrando apenas essas linhas pelas demais chaves,
+    sem varrer a tabela inteira.
+
+    Filtros aceitos por chave: um valor escalar, uma tupla (início, fim)
+    inclusiva ou uma lista de valores.
+    """
+
+    _instance = None
+
+    def __init__(self, results, races):
+        self._results = results
+        self.frame = results.merge(races[['raceId', 'year', 'circuitId']], on='raceId').reset_index(drop=True)
+
+        self._columns = {}
+        self._order = {}
+        self._keys = {}
+        self._offsets = {}
+        for key in INDEXED_KEYS:
+            values = self.frame[key].to_numpy()
+            order = np.argsort(values, kind='stable')
+            keys, starts = np.unique(values[order], return_index=True)
+
+            self._columns[key] = values
+            self._order[key] = order
+            self._keys[key] = keys
+            self._offsets[key] = np.append(starts, len(values))
+
+    @staticmethod
+    def get():
+        """
+        Retorna o índice dos dados carregados, construindo-o uma única vez.
+        """
+        dataframes = DataLoader.get_dataframes()
+        instance = ResultsIndex._instance
+        if instance is None or instance._results is not dataframes["results"]:
+            instance = ResultsIndex(dataframes["results"], dataframes["races"])
+            ResultsIndex._instance = instance
+        return instance
+
+    def _key_bounds(self, key, value):
+        """
+        Converte um filtro em intervalos [início, fim) sobre os valores únicos.
+        """
+        keys = self._keys[key]
+        if isinstance(value, tuple):
+            start, end = value
+            return [(np.searchsorted(keys, start, side='left'), np.searchsorted(keys, end, side='right'))]
+
+        values = np.atleast_1d(value)
+        positions = np.searchsorted(keys, values)
+        found = positions < len(keys)
+        found[found] = keys[positions[found]] == values[found]
+        return [(pos, pos + 1) for pos in np.unique(positions[found])]
+
+    def _slice_rows(self, key, bounds):
+        """
+        Devolve as linhas (ordenadas) cobertas pelos intervalos de uma chave.
+        """
+        offsets = self._offsets[key]
+        order = self._order[key]
+        parts = [order[offsets[start]:offsets[end]] for start, end in bounds]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(parts))
+
+    def _matches(self, key, value, rows):
+        """
+        Testa um filtro apenas nas linhas já selecionadas.
+        """
+        values = self._columns[key][rows]
+        if isinstance(value, tuple):
+            start, end = value
+            return (values >= start) & (values <= end)
+        return np.isin(values, np.atleast_1d(value))
+
+    def rows(self, **filters):
+        """
+        Retorna as posições das linhas que satisfazem todos os filtros.
+        """
+        unknown = set(filters) - set(INDEXED_KEYS)
+        if unknown:
+            raise ValueError(f"Chaves não indexadas: {sorted(unknown)}")
+        if not filters:
+            return np.arange(len(self.frame))
+
+        # Começar pela chave mais seletiva (menor número de linhas)
+        bounds = {key: self._key_bounds(key, value) for key, value in filters.items()}
+        sizes = {
+            key: sum(self._offsets[key][end] - self._offsets[key][start] for start, end in key_bounds)
+            for key, key_bounds in bounds.items()
+        }
+        first = min(sizes, key=sizes.get)
+        rows = self._slice_rows(first, bounds[first])
+
+        for key, value in filters.items():
+            if key != first and len(rows):
+                rows = rows[self._matches(key, value, rows)]
+        return rows
+
+    def select(self, **filters):
+        """
+        Retorna o DataFrame de resultados (com year e circuitId) filtrado.
+
+        Exemplo: ResultsIndex.get().select(driverId=1, year=(2010, 2015))
+        """
+        return self.frame.iloc[self.rows(**filters)]
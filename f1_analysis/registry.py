@@ -0,0 +1,228 @@
+import numpy as np
+import pandas as pd
+
+from f1_analysis.data_loader import DataLoader
+
+# Tipo de entidade -> (coluna de id em 'results', tabela de nomes, coluna de nome, rótulo)
+ENTITY_KINDS = {
+    "driver": ("driverId", "drivers", "surname", "Piloto"),
+    "constructor": ("constructorId", "constructors", "name", "Equipe"),
+}
+
+
+def _missing(keys):
+    """
+    Máscara dos valores NaN (só colunas de ponto flutuante podem tê-los).
+    """
+    if keys.dtype.kind in "fc":
+        return np.isnan(keys)
+    return np.zeros(len(keys), dtype=bool)
+
+
+def _stable_order(keys, descending):
+    """
+    Índices que ordenam 'keys' de forma estável, em ordem crescente ou decrescente.
+
+    Para a ordem decrescente a ordenação estável é feita sobre o array
+    invertido e o resultado é invertido de volta, o que preserva a ordem
+    original dos empates sem precisar negar os valores. NaN vai sempre para
+    o fim, nas duas direções, na ordem original.
+    """
+    missing = _missing(keys)
+    if missing.any():
+        present = np.flatnonzero(~missing)
+        return np.concatenate([present[_stable_order(keys[present], descending)], np.flatnonzero(missing)])
+    if not descending:
+        return np.argsort(keys, kind='stable')
+    last = len(keys) - 1
+    return last - np.argsort(keys[::-1], kind='stable')[::-1]
+
+
+class EntityRegistry:
+    """
+    Mapeia ids de pilotos/equipes para índices densos 0..n-1.
+
+    O mapeamento é um array indexado pelo próprio id, então traduzir uma
+    coluna inteira de ids é um único acesso vetorizado.
+    """
+
+    _instances = {}
+
+    def __init__(self, ids):
+        self.ids = np.unique(np.asarray(ids))
+        self._lookup = np.full(int(self.ids.max(initial=-1)) + 1, -1, dtype=np.intp)
+        self._lookup[self.ids] = np.arange(len(self.ids))
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def get(kind):
+        """
+        Retorna o registro de pilotos ('driver') ou equipes ('constructor') dos dados carregados.
+        """
+        column, table, _, _ = ENTITY_KINDS[kind]
+        frame = DataLoader.get_dataframes()[table]
+        cached = EntityRegistry._instances.get(kind)
+        if cached is None or cached[0] is not frame:
+            cached = (frame, EntityRegistry(frame[column].to_numpy()))
+            EntityRegistry._instances[kind] = cached
+        return cached[1]
+
+    def index(self, ids):
+        """
+        Converte ids em índices densos; ids desconhecidos geram ValueError.
+        """
+        ids = np.asarray(ids)
+        known = (ids >= 0) & (ids < len(self._lookup))
+        dense = np.where(known, self._lookup[np.where(known, ids, 0)], -1)
+        if (dense < 0).any():
+            raise ValueError(f"Ids não registrados: {np.unique(ids[dense < 0])[:5].tolist()}")
+        return dense
+
+
+class MetricTable:
+    """
+    Métricas por entidade guardadas como colunas NumPy contíguas.
+
+    Cada linha de dados é associada uma única vez à linha da tabela da sua
+    entidade; a partir daí somas, contagens e mínimos são bincount/ufunc.at
+    sobre esse array de grupos, sem dicionários por entidade.
+    """
+
+    def __init__(self, registry, entity_ids):
+        self.registry = registry
+        dense = registry.index(entity_ids)
+        counts = np.bincount(dense, minlength=len(registry))
+
+        # Só as entidades presentes nos dados viram linhas, em ordem de id
+        self._rows = np.flatnonzero(counts)
+        self._row_of = np.full(len(registry), -1, dtype=np.intp)
+        self._row_of[self._rows] = np.arange(len(self._rows))
+        self._group = self._row_of[dense]
+        self._counts = counts[self._rows]
+        self.columns = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        if isinstance(values, list):
+            # Listas (ex.: nomes de corridas por entidade) viram colunas de objetos
+            column = np.empty(len(values), dtype=object)
+            for position, value in enumerate(values):
+                column[position] = value
+            values = column
+        values = np.asarray(values)
+        if values.ndim == 0:
+            values = np.full(len(self), values)
+        self.columns[name] = values
+
+    @property
+    def ids(self):
+        return self.registry.ids[self._rows]
+
+    def rows_of(self, entity_ids):
+        """
+        Linhas da tabela correspondentes a ids de entidade.
+        """
+        return self._row_of[self.registry.index(entity_ids)]
+
+    def count(self, where=None):
+        """
+        Número de linhas de dados por entidade (opcionalmente só onde 'where').
+        """
+        if where is None:
+            return self._counts
+        return np.bincount(self._group[where], minlength=len(self))
+
+    def sum(self, values, where=None):
+        """
+        Soma por entidade; mantém o tipo inteiro quando os valores são inteiros.
+        """
+        values = np.asarray(values)
+        group = self._group
+        if where is not None:
+            values, group = values[where], group[where]
+        totals = np.bincount(group, weights=values, minlength=len(self))
+        if values.dtype.kind == "b":
+            return totals.astype(np.int64)
+        return totals.astype(values.dtype) if values.dtype.kind in "iu" else totals
+
+    def min(self, values):
+        """
+        Menor valor por entidade.
+        """
+        values = np.asarray(values)
+        fill = np.iinfo(values.dtype).max if values.dtype.kind in "iu" else np.inf
+        minimum = np.full(len(self), fill, dtype=values.dtype)
+        np.minimum.at(minimum, self._group, values)
+        return minimum
+
+    def first(self, values):
+        """
+        Valor da primeira linha de dados de cada entidade.
+        """
+        _, first_rows = np.unique(self._group, return_index=True)
+        return np.asarray(values)[first_rows]
+
+    def nunique(self, values):
+        """
+        Número de valores distintos por entidade (ex.: corridas disputadas).
+        """
+        pairs = np.unique(np.stack([self._group, np.asarray(values)]), axis=1)
+        return np.bincount(pairs[0], minlength=len(self))
+
+    def rank(self, by, descending=True, top=None):
+        """
+        Retorna uma nova tabela ordenada por uma coluna.
+
+        A ordenação é estável (empates mantêm a ordem por id) e não depende de
+        negar a coluna, então vale para colunas inteiras sem sinal e booleanas.
+        Linhas com NaN na coluna ficam no fim, nas duas direções.
+        Com 'top', só as N primeiras são mantidas, selecionadas com
+        argpartition antes de ordenar apenas essas.
+        """
+        keys = self.columns[by]
+        present = np.flatnonzero(~_missing(keys))
+        if top is not None and top < len(present):
+            values = keys[present]
+            if descending:
+                boundary = values[np.argpartition(values, len(values) - top)[len(values) - top:]].min()
+                candidates = present[values >= boundary]
+            else:
+                boundary = values[np.argpartition(values, top - 1)[:top]].max()
+                candidates = present[values <= boundary]
+            # Os empates na fronteira entram todos para manter o desempate por id
+            order = candidates[_stable_order(keys[candidates], descending)][:top]
+        elif top is not None:
+            order = _stable_order(keys, descending)[:top]
+        else:
+            order = _stable_order(keys, descending)
+
+        ranked = MetricTable.__new__(MetricTable)
+        ranked.registry = self.registry
+        ranked._rows = self._rows[order]
+        ranked._row_of = np.full(len(self.registry), -1, dtype=np.intp)
+        ranked._row_of[ranked._rows] = np.arange(len(ranked._rows))
+        ranked._group = None  # dados brutos não se aplicam a uma tabela reordenada
+        ranked._counts = self._counts[order]
+        ranked.columns = {name: values[order] for name, values in self.columns.items()}
+        return ranked
+
+    def to_frame(self):
+        """
+        DataFrame com as colunas da tabela, sem copiar os arrays.
+        """
+        return pd.DataFrame(self.columns, copy=False)
+
+    def to_records(self):
+        """
+        Lista de dicionários (formato do dash_table) com tipos nativos do Python.
+        """
+        names = list(self.columns)
+        values = [column.tolist() for column in self.columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
@@ -0,0 +1,125 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from f1_analysis.data_loader import DataLoader
+from f1_analysis.query import ResultsIndex
+from f1_analysis.registry import ENTITY_KINDS
+
+# Categorias de status (o código é a posição na tupla)
+STATUS_CATEGORIES = (
+    "finished", "lapped", "mechanical", "accident", "dsq", "unclassified", "did_not_start", "unknown",
+)
+FINISHED, LAPPED, MECHANICAL, ACCIDENT, DSQ, UNCLASSIFIED, DID_NOT_START, UNKNOWN = range(len(STATUS_CATEGORIES))
+
+# Resultados que contam como chegada classificada
+CLASSIFIED = (FINISHED, LAPPED)
+
+CATEGORY_LABELS = {
+    FINISHED: "Completou",
+    LAPPED: "Volta(s) atrás",
+    MECHANICAL: "Falha Mecânica",
+    ACCIDENT: "Acidente",
+    DSQ: "Desclassificado",
+    UNCLASSIFIED: "Não Classificado",
+    DID_NOT_START: "Não Largou",
+    UNKNOWN: "Status Desconhecido",
+}
+
+# Regras de classificação do texto de status.csv; o que não casar é falha mecânica
+# (inclusive falhas de banco e cinto, como "Seat" e "Safety belt")
+_STATUS_RULES = (
+    (FINISHED, re.compile(r"^Finished$")),
+    (LAPPED, re.compile(r"^\+\d+ Laps?$")),
+    (DSQ, re.compile(r"Disqualified|Excluded|Underweight")),
+    (ACCIDENT, re.compile(r"Accident|Collision|Spun off|Damage|Debris|Injury", re.IGNORECASE)),
+    # Largou mas não foi classificado
+    (UNCLASSIFIED, re.compile(r"Not classified|Not restarted", re.IGNORECASE)),
+    # Não largou: eliminado antes da corrida, desistência ou problema físico pré-corrida
+    # (lesões durante a corrida, "Injury", ficam em acidente)
+    (DID_NOT_START, re.compile(
+        r"Did not (pre)?qualify|Did not start|107%|Withdrew|Illness|Injured|Unwell|Physical",
+        re.IGNORECASE,
+    )),
+)
+
+
+def status_category_lookup(status):
+    """
+    Pré-calcula o array statusId -> código de categoria a partir de status.csv.
+
+    O array é indexado diretamente pelo statusId, então classificar a tabela
+    de resultados inteira é um único acesso vetorizado: lookup[statusIds].
+    """
+    status_ids = status['statusId'].to_numpy()
+    lookup = np.full(status_ids.max() + 1, UNKNOWN, dtype=np.int8)
+    for status_id, text in zip(status_ids, status['status'].astype(str)):
+        lookup[status_id] = next(
+            (category for category, pattern in _STATUS_RULES if pattern.search(text)), MECHANICAL
+        )
+    return lookup
+
+
+def classify_status(status_ids, lookup):
+    """
+    Aplica o lookup a um array de statusId; ids fora de status.csv viram UNKNOWN.
+    """
+    status_ids = np.asarray(status_ids)
+    known = (status_ids >= 0) & (status_ids < len(lookup))
+    return np.where(known, lookup[np.where(known, status_ids, 0)], UNKNOWN).astype(np.int8)
+
+
+def is_classified(categories):
+    """
+    Máscara dos resultados classificados (completou ou terminou com voltas atrás).
+    """
+    return np.isin(categories, CLASSIFIED)
+
+
+def reliability_metrics(kind="driver", year=None):
+    """
+    Métricas de confiabilidade por piloto ('driver') ou equipe ('constructor') e temporada.
+
+    Largadas são todos os resultados exceto os que não largaram; não
+    classificados e status desconhecidos contam como largadas sem chegada.
+    """
+    if kind not in ENTITY_KINDS:
+        raise ValueError(f"Tipo de entidade inválido: {kind}")
+    column, table, name_column, label = ENTITY_KINDS[kind]
+
+    index = ResultsIndex.get()
+    frame = index.frame if year is None else index.select(year=year)
+    names = DataLoader.get_dataframes()[table].set_index(column)[name_column]
+
+    # Contagem por (temporada, entidade, categoria) num único bincount
+    groups = pd.MultiIndex.from_arrays([frame['year'].to_numpy(), frame[column].to_numpy()])
+    group_idx, group_keys = pd.factorize(groups)
+    n_categories = len(STATUS_CATEGORIES)
+    counts = np.bincount(
+        group_idx * n_categories + frame['statusCategory'].to_numpy(),
+        minlength=len(group_keys) * n_categories,
+    ).reshape(len(group_keys), n_categories)
+
+    starts = counts.sum(axis=1) - counts[:, DID_NOT_START]
+    classified = counts[:, FINISHED] + counts[:, LAPPED]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        finish_rate = np.where(starts > 0, classified / starts * 100, np.nan)
+        mechanical_rate = np.where(starts > 0, counts[:, MECHANICAL] / starts * 100, np.nan)
+
+    entity_ids = group_keys.get_level_values(1)
+    metrics_df = pd.DataFrame({
+        'Ano': group_keys.get_level_values(0),
+        label: names.reindex(entity_ids).to_numpy(),
+        'Largadas': starts,
+        'Classificados': classified,
+        CATEGORY_LABELS[MECHANICAL]: counts[:, MECHANICAL],
+        CATEGORY_LABELS[ACCIDENT]: counts[:, ACCIDENT],
+        CATEGORY_LABELS[DSQ]: counts[:, DSQ],
+        CATEGORY_LABELS[UNCLASSIFIED]: counts[:, UNCLASSIFIED],
+        CATEGORY_LABELS[DID_NOT_START]: counts[:, DID_NOT_START],
+        CATEGORY_LABELS[UNKNOWN]: counts[:, UNKNOWN],
+        'Taxa de Chegada (%)': np.round(finish_rate, 2),
+        'Taxa de Falha Mecânica (%)': np.round(mechanical_rate, 2),
+    })
+    return metrics_df.sort_values(['Ano', 'Taxa de Chegada (%)'], ascending=[False, False], ignore_index=True)
@@ -0,0 +1,186 @@
+import glob
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Colunas mínimas esperadas em cada arquivo
+REQUIRED_COLUMNS = {
+    "drivers": ("driverId", "surname"),
+    "races": ("raceId", "year", "round", "circuitId", "name"),
+    "driver_standings": ("raceId", "driverId", "points"),
+    "constructors": ("constructorId", "name"),
+    "constructor_standings": ("raceId", "constructorId", "points"),
+    "results": ("resultId", "raceId", "driverId", "constructorId", "grid", "positionOrder", "points", "statusId"),
+    "circuits": ("circuitId", "name"),
+    "status": ("statusId", "status"),
+    "qualifying": ("qualifyId", "raceId", "driverId", "constructorId", "position", "q1", "q2", "q3"),
+}
+
+# Chave primária de cada tabela (precisa ser única e não nula)
+PRIMARY_KEYS = {
+    "drivers": "driverId",
+    "races": "raceId",
+    "constructors": "constructorId",
+    "results": "resultId",
+    "circuits": "circuitId",
+    "status": "statusId",
+    "qualifying": "qualifyId",
+}
+
+# (tabela, coluna) -> (tabela referenciada, chave)
+FOREIGN_KEYS = (
+    ("results", "raceId", "races", "raceId"),
+    ("results", "driverId", "drivers", "driverId"),
+    ("results", "constructorId", "constructors", "constructorId"),
+    ("results", "statusId", "status", "statusId"),
+    ("races", "circuitId", "circuits", "circuitId"),
+    ("qualifying", "raceId", "races", "raceId"),
+    ("qualifying", "driverId", "drivers", "driverId"),
+    ("qualifying", "constructorId", "constructors", "constructorId"),
+)
+
+
+class DataValidationError(ValueError):
+    """
+    O dataset baixado não passou na validação (arquivo truncado, chaves inválidas...).
+    """
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """
+    Calcula o SHA-256 do arquivo lendo-o em blocos, sem carregá-lo inteiro na memória.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """
+    Diretório do manifesto e dos DataFrames em cache (F1_ANALYSIS_CACHE sobrescreve).
+    """
+    return os.environ.get("F1_ANALYSIS_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "f1_analysis"))
+
+
+class DatasetManifest:
+    """
+    Manifesto dos arquivos já validados: hash, tamanho e número de linhas por tabela.
+
+    Um arquivo cujo hash bate com o manifesto já foi validado e tem o DataFrame
+    correspondente em cache (pickle), então não precisa ser lido do CSV nem
+    validado de novo.
+    """
+
+    FILE_NAME = "manifest.json"
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.path = os.path.join(self.cache_dir, self.FILE_NAME)
+        self.tables = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    self.tables = json.load(file).get("tables", {})
+            except (OSError, ValueError):
+                # Manifesto ilegível: tudo será tratado como alterado
+                self.tables = {}
+
+    def is_verified(self, table, digest):
+        """
+        Indica se o arquivo com esse hash já foi validado e está em cache.
+        """
+        entry = self.tables.get(table)
+        return entry is not None and entry["sha256"] == digest and os.path.exists(self.frame_path(table, digest))
+
+    def previous_rows(self, table):
+        """
+        Número de linhas da última versão validada da tabela (ou None).
+        """
+        entry = self.tables.get(table)
+        return entry["rows"] if entry else None
+
+    def frame_path(self, table, digest):
+        return os.path.join(self.cache_dir, f"{table}-{digest[:16]}.pkl")
+
+    def record(self, table, digest, size, frame):
+        """
+        Registra uma tabela validada e guarda o DataFrame em cache, removendo versões antigas.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.frame_path(table, digest)
+        for stale in glob.glob(os.path.join(self.cache_dir, f"{table}-*.pkl")):
+            if stale != path:
+                os.remove(stale)
+        frame.to_pickle(path)
+        self.tables[table] = {"sha256": digest, "size": size, "rows": len(frame)}
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"tables": self.tables}, file, indent=2)
+        os.replace(temp_path, self.path)
+
+
+def check_table(table, frame):
+    """
+    Validações estruturais de uma tabela; retorna a lista de problemas encontrados.
+    """
+    problems = []
+    missing = [column for column in REQUIRED_COLUMNS.get(table, ()) if column not in frame.columns]
+    if missing:
+        problems.append(f"{table}: colunas ausentes {missing}")
+    if frame.empty:
+        problems.append(f"{table}: arquivo sem linhas")
+
+    key = PRIMARY_KEYS.get(table)
+    if key is not None and key in frame.columns:
+        keys = frame[key]
+        if keys.isna().any():
+            problems.append(f"{table}: chave '{key}' com valores nulos")
+        elif keys.duplicated().any():
+            problems.append(f"{table}: chave '{key}' com valores duplicados")
+
+    # Uma linha final cortada deixa vazias colunas que estão sempre preenchidas
+    if len(frame) > 1:
+        always_filled = frame.iloc[:-1].notna().all()
+        if (always_filled & frame.iloc[-1].isna()).any():
+            problems.append(f"{table}: última linha incompleta (arquivo truncado?)")
+    return problems
+
+
+def check_row_count(table, frame, previous_rows=None):
+    """
+    Compara o número de linhas com a última versão validada; retorna os avisos.
+
+    Menos linhas pode ser truncamento, mas também uma correção legítima na
+    origem (ex.: uma corrida removida), então não bloqueia a carga: o
+    truncamento de fato é pego pela verificação da última linha em check_table.
+    """
+    if previous_rows is not None and len(frame) < previous_rows:
+        return [f"{table}: {len(frame)} linhas, a versão anterior tinha {previous_rows}"]
+    return []
+
+
+def check_references(dataframes, tables=None):
+    """
+    Integridade referencial vetorizada (np.isin) entre as tabelas carregadas.
+
+    Se 'tables' for informado, só verifica as relações que envolvem essas tabelas.
+    """
+    problems = []
+    for table, column, target, key in FOREIGN_KEYS:
+        if tables is not None and table not in tables and target not in tables:
+            continue
+        if table not in dataframes or target not in dataframes:
+            continue
+        values = dataframes[table][column].to_numpy()
+        orphans = ~np.isin(values, dataframes[target][key].to_numpy())
+        if orphans.any():
+            sample = np.unique(values[orphans])[:5].tolist()
+            problems.append(f"{table}.{column}: {int(orphans.sum())} linhas sem {target}.{key} (ex.: {sample})")
+    return problems
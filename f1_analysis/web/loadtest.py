@@ -0,0 +1,164 @@
+"""
+Teste de carga das views do dashboard contra um servidor local.
+
+Uso:
+
+    # 1) subir o servidor de produção
+    python -m f1_analysis.web.serve
+    # 2) em outro terminal, disparar a carga
+    python -m f1_analysis.web.loadtest --url http://127.0.0.1:8050 --requests 200 --concurrency 16
+
+O script espera /health/ready responder 200 e então, para cada view, envia
+as mesmas requisições que o navegador envia ao clicar no botão ou mudar o
+filtro (POST em /_dash-update-component). Para cada view mostra requisições
+por segundo, latência mediana e p95 e o número de erros. As views capturam
+exceções e respondem 200 com a mensagem "Erro: ..."; essas respostas também
+contam como erro. Só usa a biblioteca padrão, então roda em qualquer máquina
+com o pacote.
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BUTTONS = (
+    "btn-drivers", "btn-teams", "btn-advanced", "btn-circuits", "btn-qualifying", "btn-reliability", "btn-form",
+)
+
+# Início da mensagem que as views *_dash renderizam quando capturam uma exceção
+ERROR_MARKER = b'"Erro: '
+
+
+def button_payload(button_id, exclude_dnf=False):
+    """
+    Corpo do callback principal como se o botão tivesse sido clicado.
+    """
+    return {
+        "output": "output-area.children",
+        "outputs": {"id": "output-area", "property": "children"},
+        "inputs": [
+            {"id": button, "property": "n_clicks", "value": 1 if button == button_id else None}
+            for button in BUTTONS
+        ],
+        "changedPropIds": [f"{button_id}.n_clicks"],
+        "state": [{"id": "exclude-dnf", "property": "value", "value": ["exclude"] if exclude_dnf else []}],
+    }
+
+
+def filter_payload(output_id, inputs):
+    """
+    Corpo de um callback de detalhamento (dropdown/radio) com os valores informados.
+    """
+    return {
+        "output": f"{output_id}.children",
+        "outputs": {"id": output_id, "property": "children"},
+        "inputs": [{"id": component, "property": "value", "value": value} for component, value in inputs],
+        "changedPropIds": [f"{inputs[0][0]}.value"],
+    }
+
+
+def build_scenarios(circuit_id, year, entity_ids=(1,)):
+    """
+    Uma requisição representativa de cada view do dashboard.
+    """
+    return {
+        "pilotos": button_payload("btn-drivers"),
+        "equipes": button_payload("btn-teams"),
+        "avançada": button_payload("btn-advanced"),
+        "avançada (sem DNF)": button_payload("btn-advanced", exclude_dnf=True),
+        "circuitos": button_payload("btn-circuits"),
+        "circuito (detalhe)": filter_payload(
+            "circuit-output", [("circuit-dropdown", circuit_id), ("circuit-entity", "driver")]
+        ),
+        "classificação": filter_payload("qualifying-output", [("qualifying-year", year)]),
+        "confiabilidade": filter_payload(
+            "reliability-output", [("reliability-entity", "constructor"), ("reliability-year", year)]
+        ),
+        "forma (série)": filter_payload(
+            "form-output",
+            [("form-entity", "driver"), ("form-selection", list(entity_ids)),
+             ("form-metric", "Pontos na Janela"), ("form-window", 5)],
+        ),
+    }
+
+
+def wait_until_ready(url, timeout):
+    """
+    Aguarda o endpoint de prontidão responder 200.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/health/ready", timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(1)
+    raise TimeoutError(f"Servidor em {url} não ficou pronto em {timeout}s")
+
+
+def _post(endpoint, body):
+    request = urllib.request.Request(endpoint, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            ok = response.status == 200 and ERROR_MARKER not in response.read()
+    except (urllib.error.URLError, ConnectionError):
+        ok = False
+    return time.perf_counter() - start, ok
+
+
+def run_scenario(url, payload, total_requests, concurrency):
+    """
+    Dispara 'total_requests' requisições com 'concurrency' clientes simultâneos.
+    """
+    endpoint = f"{url}/_dash-update-component"
+    body = json.dumps(payload).encode("utf-8")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(lambda _: _post(endpoint, body), range(total_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, ok in samples if ok)
+    errors = sum(1 for _, ok in samples if not ok)
+    if len(latencies) >= 2:
+        p95 = statistics.quantiles(latencies, n=20)[18]
+    else:
+        p95 = latencies[0] if latencies else float("nan")
+    return {
+        "rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": p95 * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga das views do F1 Analysis Dashboard.")
+    parser.add_argument("--url", default="http://127.0.0.1:8050")
+    parser.add_argument("--requests", type=int, default=200, help="requisições por view")
+    parser.add_argument("--concurrency", type=int, default=16, help="clientes simultâneos")
+    parser.add_argument("--circuit", type=int, default=1, help="circuitId da view de detalhe")
+    parser.add_argument("--year", type=int, default=2024, help="temporada das views por ano")
+    parser.add_argument("--drivers", type=int, nargs="+", default=[1], help="driverIds da view de forma")
+    parser.add_argument("--ready-timeout", type=int, default=300)
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    wait_until_ready(url, args.ready_timeout)
+
+    print(f"{'View':<22}{'req/s':>10}{'p50 (ms)':>12}{'p95 (ms)':>12}{'erros':>8}")
+    for name, payload in build_scenarios(args.circuit, args.year, args.drivers).items():
+        # Uma requisição de aquecimento para não medir a primeira renderização
+        _post(f"{url}/_dash-update-component", json.dumps(payload).encode("utf-8"))
+        stats = run_scenario(url, payload, args.requests, args.concurrency)
+        print(f"{name:<22}{stats['rps']:>10.1f}{stats['p50_ms']:>12.1f}{stats['p95_ms']:>12.1f}{stats['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,117 +1,269 @@
-import dash
-from dash import dcc, html, Input, Output
-import plotly.express as px
-import numpy as np
-import pandas as pd
-from f1_analysis.main import DataLoader
-from dash import dash_table
-import dash_bootstrap_components as dbc
-
-# Carregar dados primeiro
-print("Carregando dados...")
-DataLoader.load_data()
-
-# Inicializar o aplicativo Dash
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-app.title = "F1 Analysis Dashboard"
-
-# Layout com Bootstrap
-app.layout = dbc.Container([
-    dbc.Row([
-        dbc.Col(html.H1("F1 Analysis Dashboard", className="text-center"), width=12)
-    ], className="mb-4"),
-
-    dbc.Row([
-        dbc.Col(dbc.Button("Análise de Pilotos", id="btn-drivers", color="primary", className="me-2"), width="auto"),
-        dbc.Col(dbc.Button("Análise de Equipes", id="btn-teams", color="secondary", className="me-2"), width="auto"),
-        dbc.Col(dbc.Button("Análise Avançada", id="btn-advanced", color="success"), width="auto")
-    ], className="mb-4 justify-content-center"),
-
-    dbc.Row([
-        dbc.Col(html.Div(id="output-area"), width=12)
-    ])
-], fluid=True)
-
-# Callback para atualizar o conteúdo com base no botão clicado
-@app.callback(
-    Output("output-area", "children"),
-    [Input("btn-drivers", "n_clicks"),
-     Input("btn-teams", "n_clicks"),
-     Input("btn-advanced", "n_clicks")]
-)
-def update_output(btn_drivers, btn_teams, btn_advanced):
-    ctx = dash.callback_context
-
-    # Se nenhum botão foi clicado, mostrar mensagem inicial
-    if not ctx.triggered:
-        return html.Div("Selecione uma análise acima.", style={"textAlign": "center"})
-
-    # Identificar qual botão foi clicado
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-
-    if button_id == "btn-drivers":
-        return analyze_drivers_dash()
-
-    if button_id == "btn-teams":
-        return analyze_teams_dash()
-
-    if button_id == "btn-advanced":
-        return enhanced_analysis_dash()
+import threading
+
+from f1_analysis.data_loader import DataLoader
+
+# Estado do warm-up, consultado pelo endpoint de prontidão
+_ready = threading.Event()
+_warm_up_error = None
+
+HEALTH_PATHS = ("/health/live", "/health/ready")
+
+
+def warm_up():
+    """
+    Carrega os dados e pré-calcula os índices e agregados usados pelas views.
+
+    Depois do warm-up nenhuma requisição paga o custo de carga; o endpoint
+    /health/ready só responde 200 a partir daqui.
+    """
+    global _warm_up_error
+    from f1_analysis.circuits import CircuitAggregates
+    from f1_analysis.form import RollingForm
+    from f1_analysis.qualifying import QualifyingEntries
+
+    try:
+        print("Carregando dados...")
+        DataLoader.load_data()
+        CircuitAggregates.get()  # também constrói o ResultsIndex
+        RollingForm.get("driver")
+        RollingForm.get("constructor")
+        QualifyingEntries.get()
+    except Exception as e:
+        _warm_up_error = e
+        raise
+    _warm_up_error = None
+    _ready.set()
+
+
+def is_ready():
+    """
+    Indica se o warm-up terminou com sucesso.
+    """
+    return _ready.is_set()
+
+
+def create_app(preload=True):
+    """
+    Cria o aplicativo Dash.
+
+    Com preload=True o warm-up roda aqui mesmo (use com o --preload do gunicorn
+    para que os workers compartilhem os dados carregados no processo mestre);
+    caso contrário ele roda numa thread em segundo plano e as requisições às
+    views aguardam o fim da carga. Dash, plotly e bootstrap só são importados
+    ao criar o app, nunca ao importar o módulo.
+    """
+    import dash
+    from dash import dcc, html, Input, Output, State
+    import dash_bootstrap_components as dbc
+
+    if preload:
+        warm_up()
+    elif not is_ready():
+        threading.Thread(target=warm_up, name="f1-warm-up", daemon=True).start()
+
+    # Inicializar o aplicativo Dash
+    # As views por circuito criam componentes dinamicamente, daí suppress_callback_exceptions
+    app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP], suppress_callback_exceptions=True)
+    app.title = "F1 Analysis Dashboard"
+
+    # Endpoints de saúde: liveness sempre 200, readiness só depois do warm-up
+    @app.server.route("/health/live")
+    def health_live():
+        return {"status": "ok"}
+
+    @app.server.route("/health/ready")
+    def health_ready():
+        if is_ready():
+            return {"status": "ready"}
+        if _warm_up_error is not None:
+            return {"status": "error", "detail": str(_warm_up_error)}, 503
+        return {"status": "warming-up"}, 503
+
+    if not preload:
+        @app.server.before_request
+        def wait_for_warm_up():
+            from flask import request
+
+            if request.path in HEALTH_PATHS:
+                return None
+            while not _ready.wait(timeout=0.5):
+                if _warm_up_error is not None:
+                    return {"status": "error", "detail": str(_warm_up_error)}, 503
+            return None
+
+    # Layout com Bootstrap
+    app.layout = dbc.Container([
+        dbc.Row([
+            dbc.Col(html.H1("F1 Analysis Dashboard", className="text-center"), width=12)
+        ], className="mb-4"),
+
+        dbc.Row([
+            dbc.Col(dbc.Button("Análise de Pilotos", id="btn-drivers", color="primary", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Análise de Equipes", id="btn-teams", color="secondary", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Análise Avançada", id="btn-advanced", color="success", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Análise por Circuito", id="btn-circuits", color="info", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Classificação x Corrida", id="btn-qualifying", color="warning", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Confiabilidade", id="btn-reliability", color="danger", className="me-2"), width="auto"),
+            dbc.Col(dbc.Button("Forma (Série Temporal)", id="btn-form", color="dark"), width="auto")
+        ], className="mb-2 justify-content-center"),
+
+        dbc.Row([
+            dbc.Col(dcc.Checklist(
+                id="exclude-dnf",
+                options=[{"label": " Excluir não classificados da pontuação ajustada", "value": "exclude"}],
+                value=[]
+            ), width="auto")
+        ], className="mb-4 justify-content-center"),
+
+        dbc.Row([
+            dbc.Col(html.Div(id="output-area"), width=12)
+        ])
+    ], fluid=True)
+
+    # Callback para atualizar o conteúdo com base no botão clicado
+    @app.callback(
+        Output("output-area", "children"),
+        [Input("btn-drivers", "n_clicks"),
+         Input("btn-teams", "n_clicks"),
+         Input("btn-advanced", "n_clicks"),
+         Input("btn-circuits", "n_clicks"),
+         Input("btn-qualifying", "n_clicks"),
+         Input("btn-reliability", "n_clicks"),
+         Input("btn-form", "n_clicks")],
+        State("exclude-dnf", "value")
+    )
+    def update_output(btn_drivers, btn_teams, btn_advanced, btn_circuits, btn_qualifying, btn_reliability,
+                      btn_form, exclude_dnf):
+        ctx = dash.callback_context
+
+        # Se nenhum botão foi clicado, mostrar mensagem inicial
+        if not ctx.triggered:
+            return html.Div("Selecione uma análise acima.", style={"textAlign": "center"})
+
+        # Identificar qual botão foi clicado
+        button_id = ctx.triggered[0]["prop_id"].split(".")[0]
+
+        if button_id == "btn-drivers":
+            return analyze_drivers_dash()
+
+        if button_id == "btn-teams":
+            return analyze_teams_dash()
+
+        if button_id == "btn-advanced":
+            return enhanced_analysis_dash(exclude_dnf=bool(exclude_dnf))
+
+        if button_id == "btn-circuits":
+            return circuit_view_dash()
+
+        if button_id == "btn-qualifying":
+            return qualifying_view_dash()
+
+        if button_id == "btn-reliability":
+            return reliability_view_dash()
+
+        if button_id == "btn-form":
+            return form_view_dash()
+
+    # Callback da view por circuito (seleção de circuito e tipo de entidade)
+    @app.callback(
+        Output("circuit-output", "children"),
+        [Input("circuit-dropdown", "value"),
+         Input("circuit-entity", "value")]
+    )
+    def update_circuit(circuit_id, kind):
+        if circuit_id is None:
+            return html.Div("Selecione um circuito.", style={"textAlign": "center"})
+        return circuit_detail_dash(circuit_id, kind)
+
+    # Callback da view de classificação x corrida (seleção da temporada)
+    @app.callback(
+        Output("qualifying-output", "children"),
+        Input("qualifying-year", "value")
+    )
+    def update_qualifying(year):
+        if year is None:
+            return html.Div("Selecione uma temporada.", style={"textAlign": "center"})
+        return qualifying_detail_dash(year)
+
+    # Callback da view de confiabilidade (tipo de entidade e temporada)
+    @app.callback(
+        Output("reliability-output", "children"),
+        [Input("reliability-entity", "value"),
+         Input("reliability-year", "value")]
+    )
+    def update_reliability(kind, year):
+        if year is None:
+            return html.Div("Selecione uma temporada.", style={"textAlign": "center"})
+        return reliability_detail_dash(kind, year)
+
+    # Callbacks da view de forma: entidades disponíveis e gráfico da série temporal
+    @app.callback(
+        [Output("form-selection", "options"),
+         Output("form-selection", "value")],
+        Input("form-entity", "value")
+    )
+    def update_form_options(kind):
+        from f1_analysis.form import RollingForm, top_entities
+        from f1_analysis.registry import ENTITY_KINDS
+
+        column = ENTITY_KINDS[kind][0]
+        entities = RollingForm.get(kind)[[column, 'Nome']].drop_duplicates(column).sort_values('Nome')
+        options = [{"label": name, "value": int(entity)} for entity, name in entities.itertuples(index=False)]
+        return options, [int(entity) for entity in top_entities(kind)]
+
+    @app.callback(
+        Output("form-output", "children"),
+        [Input("form-entity", "value"),
+         Input("form-selection", "value"),
+         Input("form-metric", "value"),
+         Input("form-window", "value")]
+    )
+    def update_form(kind, selection, metric, window):
+        if not selection:
+            return html.Div("Selecione ao menos uma entidade.", style={"textAlign": "center"})
+        return form_detail_dash(kind, selection, metric, window)
+
+    return app
 
 
 def analyze_drivers_dash():
     """
     Análise de pilotos com métricas adicionais para exibição no Dash.
     """
+    import numpy as np
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.query import ResultsIndex
+    from f1_analysis.registry import EntityRegistry, MetricTable
+
     try:
         dataframes = DataLoader.get_dataframes()
         drivers = dataframes.get("drivers")
-        races = dataframes.get("races")
-        results = dataframes.get("results")
 
-        # Relacionar os resultados com as corridas para obter o ano
-        results_with_year = results.merge(races[['raceId', 'year']], on='raceId')
-        recent_years = results_with_year.query("2022 <= year <= 2024")
+        # Resultados com o ano, filtrados pelo índice
+        recent_years = ResultsIndex.get().select(year=(2022, 2024))
 
         # Dados
         driver_ids = recent_years['driverId'].values
         points = recent_years['points'].values
         positions = recent_years['positionOrder'].values
 
-        unique_drivers = np.unique(driver_ids)
-        metrics = {}
-        for driver in unique_drivers:
-            driver_points = points[driver_ids == driver]
-            driver_positions = positions[driver_ids == driver]
-
-            total_points = np.sum(driver_points)
-            total_wins = np.sum(driver_positions == 1)
-            total_races = len(driver_positions)
-            avg_position = np.mean(driver_positions)
-            win_rate = (total_wins / total_races) * 100 if total_races > 0 else 0
-            top_5_rate = (np.sum(driver_positions <= 5) / total_races) * 100 if total_races > 0 else 0
-
-            metrics[driver] = {
-                'Pontos Totais': total_points,
-                'Vitórias Totais': total_wins,
-                'Corridas Disputadas': total_races,
-                'Média de Posição Final': round(avg_position, 2),
-                'Vitórias (%)': round(win_rate, 2),
-                'Top 5 (%)': round(top_5_rate, 2)
-            }
+        # Métricas em colunas, uma linha por piloto
+        metrics = MetricTable(EntityRegistry.get("driver"), driver_ids)
+        total_races = metrics.count()
+        total_wins = metrics.count(where=positions == 1)
+
+        metrics['Piloto'] = drivers.set_index('driverId')['surname'].reindex(metrics.ids).to_numpy()
+        metrics['Pontos Totais'] = metrics.sum(points)
+        metrics['Vitórias Totais'] = total_wins
+        metrics['Corridas Disputadas'] = total_races
+        metrics['Média de Posição Final'] = np.round(metrics.sum(positions) / total_races, 2)
+        metrics['Vitórias (%)'] = np.round((total_wins / total_races) * 100, 2)
+        metrics['Top 5 (%)'] = np.round((metrics.count(where=positions <= 5) / total_races) * 100, 2)
 
         # Ordenar por pontos totais
-        metrics_sorted = sorted(metrics.items(), key=lambda x: x[1]['Pontos Totais'], reverse=True)
-
-        # Criar DataFrame para exibição
-        rows = []
-        for driver, data in metrics_sorted:
-            driver_name = drivers.set_index('driverId').loc[driver, 'surname']
-            rows.append({
-                'Piloto': driver_name,
-                **data
-            })
-        metrics_df = pd.DataFrame(rows)
+        metrics = metrics.rank('Pontos Totais')
+        metrics_df = metrics.to_frame()
 
         # Gráfico interativo
         fig = px.bar(
@@ -123,11 +275,10 @@ def analyze_drivers_dash():
         )
 
         # Retornar gráfico e tabela
-        from dash import dash_table
         return html.Div([
             dcc.Graph(figure=fig),
             dash_table.DataTable(
-                data=metrics_df.to_dict('records'),
+                data=metrics.to_records(),
                 columns=[{"name": i, "id": i} for i in metrics_df.columns],
                 style_table={'overflowX': 'auto', 'marginTop': '20px'}
             )
@@ -142,53 +293,39 @@ def analyze_teams_dash():
     """
     Análise de equipes com métricas adicionais para exibição no Dash.
     """
+    import numpy as np
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.query import ResultsIndex
+    from f1_analysis.registry import EntityRegistry, MetricTable
+
     try:
         dataframes = DataLoader.get_dataframes()
         constructors = dataframes.get("constructors")
-        races = dataframes.get("races")
-        results = dataframes.get("results")
 
-        # Relacionar os resultados com as corridas e as equipes
-        results_with_year = results.merge(races[['raceId', 'year']], on='raceId')
-        recent_years = results_with_year.query("2022 <= year <= 2024")
+        # Resultados com o ano, filtrados pelo índice
+        recent_years = ResultsIndex.get().select(year=(2022, 2024))
 
         # Dados
         constructor_ids = recent_years['constructorId'].values
         points = recent_years['points'].values
         positions = recent_years['positionOrder'].values
 
-        unique_constructors = np.unique(constructor_ids)
-        metrics = {}
-        for constructor in unique_constructors:
-            constructor_points = points[constructor_ids == constructor]
-            constructor_positions = positions[constructor_ids == constructor]
-
-            total_points = np.sum(constructor_points)
-            total_wins = np.sum(constructor_positions == 1)
-            total_races = len(np.unique(recent_years[constructor_ids == constructor]['raceId']))
-            avg_points_per_race = total_points / total_races if total_races > 0 else 0
-            win_rate = (total_wins / total_races) * 100 if total_races > 0 else 0
-
-            metrics[constructor] = {
-                'Pontos Totais': total_points,
-                'Vitórias Totais': total_wins,
-                'Corridas Disputadas': total_races,
-                'Média de Pontos por Corrida': round(avg_points_per_race, 2),
-                'Vitórias (%)': round(win_rate, 2)
-            }
+        # Métricas em colunas, uma linha por equipe
+        metrics = MetricTable(EntityRegistry.get("constructor"), constructor_ids)
+        total_points = metrics.sum(points)
+        total_races = metrics.nunique(recent_years['raceId'].values)
+
+        metrics['Equipe'] = constructors.set_index('constructorId')['name'].reindex(metrics.ids).to_numpy()
+        metrics['Pontos Totais'] = total_points
+        metrics['Vitórias Totais'] = metrics.count(where=positions == 1)
+        metrics['Corridas Disputadas'] = total_races
+        metrics['Média de Pontos por Corrida'] = np.round(total_points / total_races, 2)
+        metrics['Vitórias (%)'] = np.round((metrics['Vitórias Totais'] / total_races) * 100, 2)
 
         # Ordenar por pontos totais
-        metrics_sorted = sorted(metrics.items(), key=lambda x: x[1]['Pontos Totais'], reverse=True)
-
-        # Criar DataFrame para exibição
-        rows = []
-        for constructor, data in metrics_sorted:
-            constructor_name = constructors.set_index('constructorId').loc[constructor, 'name']
-            rows.append({
-                'Equipe': constructor_name,
-                **data
-            })
-        metrics_df = pd.DataFrame(rows)
+        metrics = metrics.rank('Pontos Totais')
+        metrics_df = metrics.to_frame()
 
         # Gráfico interativo
         fig = px.bar(
@@ -203,7 +340,7 @@ def analyze_teams_dash():
         return html.Div([
             dcc.Graph(figure=fig),
             dash_table.DataTable(
-                data=metrics_df.to_dict('records'),
+                data=metrics.to_records(),
                 columns=[{"name": i, "id": i} for i in metrics_df.columns],
                 style_table={'overflowX': 'auto', 'marginTop': '20px'}
             )
@@ -214,21 +351,27 @@ def analyze_teams_dash():
 
 
 
-def enhanced_analysis_dash():
+def enhanced_analysis_dash(exclude_dnf=False):
     """
     Análise avançada de pilotos com métricas adicionais para exibição no Dash.
+
+    Com exclude_dnf=True as posições ganhas só consideram chegadas classificadas.
     """
+    import numpy as np
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.query import ResultsIndex
+    from f1_analysis.registry import EntityRegistry, MetricTable
+    from f1_analysis.reliability import is_classified
+
     try:
         dataframes = DataLoader.get_dataframes()
         drivers = dataframes.get("drivers")
-        races = dataframes.get("races")
-        results = dataframes.get("results")
         constructors = dataframes.get("constructors")
 
-        # Relacionar os resultados com as corridas e as equipes
-        results_with_year = results.merge(races[['raceId', 'year']], on='raceId')
-        results_with_year = results_with_year.merge(constructors[['constructorId', 'name']], on='constructorId')
-        recent_years = results_with_year.query("2022 <= year <= 2024")
+        # Resultados com o ano, filtrados pelo índice e relacionados com as equipes
+        recent_years = ResultsIndex.get().select(year=(2022, 2024))
+        recent_years = recent_years.merge(constructors[['constructorId', 'name']], on='constructorId')
 
         # Dados
         driver_ids = recent_years['driverId'].values
@@ -237,68 +380,65 @@ def enhanced_analysis_dash():
         positions = recent_years['positionOrder'].values
         grid_positions = recent_years['grid'].values  # Classificação na largada
 
-        unique_drivers = np.unique(driver_ids)
-        metrics = {}
-        team_metrics = {}
-
-        # Cálculo de competitividade da equipe
-        unique_constructors = np.unique(constructor_ids)
-        for constructor in unique_constructors:
-            team_points = np.sum(points[constructor_ids == constructor])
-            team_wins = np.sum(positions[(constructor_ids == constructor)] == 1)
-            team_metrics[constructor] = {
-                'Total de Pontos': team_points,
-                'Total de Vitórias': team_wins
-            }
-
-        # Cálculo das métricas para cada piloto
-        for driver in unique_drivers:
-            driver_points = points[driver_ids == driver]
-            driver_positions = positions[driver_ids == driver]
-            driver_grid_positions = grid_positions[driver_ids == driver]
-            driver_constructor = constructor_ids[driver_ids == driver][0]
-
-            total_points = np.sum(driver_points)
-            total_wins = np.sum(driver_positions == 1)
-            total_podiums = np.sum(driver_positions <= 3)
-            total_races = len(driver_positions)
-            avg_grid_position = np.mean(driver_grid_positions)
-            avg_finish_position = np.mean(driver_positions)
-            positions_gained = avg_grid_position - avg_finish_position
-
-            # Representatividade na equipe
-            team_total_points = team_metrics[driver_constructor]['Total de Pontos']
-            team_total_wins = team_metrics[driver_constructor]['Total de Vitórias']
-            points_contribution = (total_points / team_total_points) * 100 if team_total_points > 0 else 0
-            wins_contribution = (total_wins / team_total_wins) * 100 if team_total_wins > 0 else 0
-
-            # Pontuação ajustada pela competitividade da equipe
-            performance_score = (
-                total_points * 0.6 +
-                total_wins * 30 +
-                total_podiums * 10 +
-                positions_gained * 5 +
-                points_contribution * 0.2
+        # Resultados considerados nas posições ganhas
+        if exclude_dnf:
+            counted = is_classified(recent_years['statusCategory'].values)
+        else:
+            counted = np.ones(len(recent_years), dtype=bool)
+
+        # Totais das equipes
+        team_metrics = MetricTable(EntityRegistry.get("constructor"), constructor_ids)
+        team_metrics['Total de Pontos'] = team_metrics.sum(points)
+        team_metrics['Total de Vitórias'] = team_metrics.count(where=positions == 1)
+
+        # Métricas dos pilotos
+        metrics = MetricTable(EntityRegistry.get("driver"), driver_ids)
+        total_points = metrics.sum(points)
+        total_wins = metrics.count(where=positions == 1)
+        total_podiums = metrics.count(where=positions <= 3)
+        total_races = metrics.count()
+        avg_grid_position = metrics.sum(grid_positions) / total_races
+
+        counted_races = metrics.count(where=counted)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            positions_gained = np.where(
+                counted_races > 0,
+                metrics.sum(grid_positions, where=counted) / counted_races
+                - metrics.sum(positions, where=counted) / counted_races,
+                0
             )
 
-            metrics[driver] = {
-                'Piloto': drivers.set_index('driverId').loc[driver, 'surname'],
-                'Pontos Totais': total_points,
-                'Vitórias Totais': total_wins,
-                'Pódios Totais': total_podiums,
-                'Corridas Disputadas': total_races,
-                'Classificação Média (Grid)': round(avg_grid_position, 2),
-                'Posições Ganhas em Média': round(positions_gained, 2),
-                '% de Pontos pela Equipe': round(points_contribution, 2),
-                '% de Vitórias pela Equipe': round(wins_contribution, 2),
-                'Pontuação Ajustada': round(performance_score, 2)
-            }
+        # Representatividade na equipe (equipe da primeira corrida do piloto)
+        team_rows = team_metrics.rows_of(metrics.first(constructor_ids))
+        team_total_points = team_metrics['Total de Pontos'][team_rows]
+        team_total_wins = team_metrics['Total de Vitórias'][team_rows]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            points_contribution = np.where(team_total_points > 0, (total_points / team_total_points) * 100, 0)
+            wins_contribution = np.where(team_total_wins > 0, (total_wins / team_total_wins) * 100, 0)
+
+        # Pontuação ajustada pela competitividade da equipe
+        performance_score = (
+            total_points * 0.6 +
+            total_wins * 30 +
+            total_podiums * 10 +
+            positions_gained * 5 +
+            points_contribution * 0.2
+        )
 
-        # Ordenar por pontuação ajustada
-        metrics_sorted = sorted(metrics.values(), key=lambda x: x['Pontuação Ajustada'], reverse=True)
+        metrics['Piloto'] = drivers.set_index('driverId')['surname'].reindex(metrics.ids).to_numpy()
+        metrics['Pontos Totais'] = total_points
+        metrics['Vitórias Totais'] = total_wins
+        metrics['Pódios Totais'] = total_podiums
+        metrics['Corridas Disputadas'] = total_races
+        metrics['Classificação Média (Grid)'] = np.round(avg_grid_position, 2)
+        metrics['Posições Ganhas em Média'] = np.round(positions_gained, 2)
+        metrics['% de Pontos pela Equipe'] = np.round(points_contribution, 2)
+        metrics['% de Vitórias pela Equipe'] = np.round(wins_contribution, 2)
+        metrics['Pontuação Ajustada'] = np.round(performance_score, 2)
 
-        # Criar DataFrame para exibição
-        metrics_df = pd.DataFrame(metrics_sorted)
+        # Ordenar por pontuação ajustada
+        metrics = metrics.rank('Pontuação Ajustada')
+        metrics_df = metrics.to_frame()
 
         # Gráfico interativo
         fig = px.bar(
@@ -310,12 +450,91 @@ def enhanced_analysis_dash():
         )
 
         # Retornar gráfico e tabela
-        from dash import dash_table
+        return html.Div([
+            dcc.Graph(figure=fig),
+            dash_table.DataTable(
+                data=metrics.to_records(),
+                columns=[{"name": i, "id": i} for i in metrics_df.columns],
+                style_table={'overflowX': 'auto', 'marginTop': '20px'}
+            )
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def circuit_view_dash():
+    """
+    View por circuito: resumo de todos os circuitos e seleção para detalhamento.
+    """
+    import dash_bootstrap_components as dbc
+    from dash import dcc, html, dash_table
+    from f1_analysis.circuits import CircuitAggregates
+
+    try:
+        circuit_df = CircuitAggregates.get().circuit_table()
+        options = [
+            {"label": row['Circuito'], "value": int(row['circuitId'])}
+            for _, row in circuit_df.sort_values('Circuito').iterrows()
+        ]
+        summary_df = circuit_df.drop(columns=['circuitId'])
+
+        return html.Div([
+            dbc.Row([
+                dbc.Col(dcc.Dropdown(id="circuit-dropdown", options=options, placeholder="Circuito"), width=6),
+                dbc.Col(dcc.RadioItems(
+                    id="circuit-entity",
+                    options=[{"label": " Pilotos", "value": "driver"}, {"label": " Equipes", "value": "constructor"}],
+                    value="driver",
+                    inline=True,
+                    inputStyle={"marginLeft": "10px"}
+                ), width="auto")
+            ], className="mb-3"),
+            html.Div(id="circuit-output"),
+            html.H4("Resumo por Circuito", style={'marginTop': '20px'}),
+            dash_table.DataTable(
+                data=summary_df.to_dict('records'),
+                columns=[{"name": i, "id": i} for i in summary_df.columns],
+                sort_action='native',
+                page_size=20,
+                style_table={'overflowX': 'auto'}
+            )
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def circuit_detail_dash(circuit_id, kind="driver"):
+    """
+    Resultados de pilotos ou equipes num circuito, a partir dos agregados em cache.
+    """
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.circuits import CircuitAggregates
+
+    try:
+        metrics_df = CircuitAggregates.get().entity_table(circuit_id, kind)
+        name_column = metrics_df.columns[0]
+
+        # Gráfico interativo
+        top_df = metrics_df.head(15)
+        fig = px.bar(
+            top_df,
+            x=name_column,
+            y=["Vitórias", "Pódios"],
+            barmode="group",
+            title=f"Vitórias e Pódios no Circuito ({'Pilotos' if kind == 'driver' else 'Equipes'})",
+            labels={"value": "Total", "variable": "Métrica"}
+        )
+
         return html.Div([
             dcc.Graph(figure=fig),
             dash_table.DataTable(
                 data=metrics_df.to_dict('records'),
                 columns=[{"name": i, "id": i} for i in metrics_df.columns],
+                sort_action='native',
+                page_size=20,
                 style_table={'overflowX': 'auto', 'marginTop': '20px'}
             )
         ])
@@ -324,8 +543,214 @@ def enhanced_analysis_dash():
         return html.Div(f"Erro: {e}", style={"color": "red"})
 
 
+def qualifying_view_dash():
+    """
+    View de classificação x corrida: seleção da temporada a detalhar.
+    """
+    import dash_bootstrap_components as dbc
+    from dash import dcc, html
+
+    try:
+        dataframes = DataLoader.get_dataframes()
+        races = dataframes.get("races")
+        qualifying = dataframes.get("qualifying")
+
+        years = sorted(races.loc[races['raceId'].isin(qualifying['raceId']), 'year'].unique(), reverse=True)
+        return html.Div([
+            dbc.Row([
+                dbc.Col(dcc.Dropdown(
+                    id="qualifying-year",
+                    options=[{"label": str(year), "value": int(year)} for year in years],
+                    value=int(years[0]) if years else None,
+                    placeholder="Temporada"
+                ), width=4)
+            ], className="mb-3"),
+            html.Div(id="qualifying-output")
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def qualifying_detail_dash(year):
+    """
+    Gap para a pole, delta para o companheiro e conversão classificação -> corrida numa temporada.
+    """
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.qualifying import qualifying_season_metrics
+
+    try:
+        metrics_df = qualifying_season_metrics(year).drop(columns=['Ano'])
+
+        # Gráfico interativo
+        fig = px.bar(
+            metrics_df,
+            x="Piloto",
+            y="Gap Mediano para a Pole (%)",
+            title=f"Gap Mediano para a Pole ({year})",
+            labels={"Gap Mediano para a Pole (%)": "Gap (%)", "Piloto": "Pilotos"}
+        )
+
+        return html.Div([
+            dcc.Graph(figure=fig),
+            dash_table.DataTable(
+                data=metrics_df.to_dict('records'),
+                columns=[{"name": i, "id": i} for i in metrics_df.columns],
+                sort_action='native',
+                style_table={'overflowX': 'auto', 'marginTop': '20px'}
+            )
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def reliability_view_dash():
+    """
+    View de confiabilidade: seleção de pilotos/equipes e da temporada.
+    """
+    import dash_bootstrap_components as dbc
+    from dash import dcc, html
+
+    try:
+        races = DataLoader.get_dataframes().get("races")
+        years = sorted(races['year'].unique(), reverse=True)
+
+        return html.Div([
+            dbc.Row([
+                dbc.Col(dcc.Dropdown(
+                    id="reliability-year",
+                    options=[{"label": str(year), "value": int(year)} for year in years],
+                    value=int(years[0]) if years else None,
+                    placeholder="Temporada"
+                ), width=4),
+                dbc.Col(dcc.RadioItems(
+                    id="reliability-entity",
+                    options=[{"label": " Pilotos", "value": "driver"}, {"label": " Equipes", "value": "constructor"}],
+                    value="constructor",
+                    inline=True,
+                    inputStyle={"marginLeft": "10px"}
+                ), width="auto")
+            ], className="mb-3"),
+            html.Div(id="reliability-output")
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def reliability_detail_dash(kind, year):
+    """
+    Abandonos por categoria (mecânico, acidente, desclassificação) numa temporada.
+    """
+    import plotly.express as px
+    from dash import dcc, html, dash_table
+    from f1_analysis.reliability import ACCIDENT, CATEGORY_LABELS, DSQ, MECHANICAL, reliability_metrics
+
+    try:
+        metrics_df = reliability_metrics(kind, year).drop(columns=['Ano'])
+        name_column = metrics_df.columns[0]
+
+        # Gráfico interativo
+        fig = px.bar(
+            metrics_df,
+            x=name_column,
+            y=[CATEGORY_LABELS[MECHANICAL], CATEGORY_LABELS[ACCIDENT], CATEGORY_LABELS[DSQ]],
+            title=f"Abandonos por Categoria ({year})",
+            labels={"value": "Abandonos", "variable": "Categoria"}
+        )
+
+        return html.Div([
+            dcc.Graph(figure=fig),
+            dash_table.DataTable(
+                data=metrics_df.to_dict('records'),
+                columns=[{"name": i, "id": i} for i in metrics_df.columns],
+                sort_action='native',
+                style_table={'overflowX': 'auto', 'marginTop': '20px'}
+            )
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def form_view_dash():
+    """
+    View de forma: pilotos/equipes, métrica e tamanho da janela móvel.
+    """
+    import dash_bootstrap_components as dbc
+    from dash import dcc, html
+    from f1_analysis.form import DEFAULT_WINDOW, FORM_METRICS, MAX_WINDOW
+
+    try:
+        return html.Div([
+            dbc.Row([
+                dbc.Col(dcc.RadioItems(
+                    id="form-entity",
+                    options=[{"label": " Pilotos", "value": "driver"}, {"label": " Equipes", "value": "constructor"}],
+                    value="driver",
+                    inline=True,
+                    inputStyle={"marginLeft": "10px"}
+                ), width="auto"),
+                dbc.Col(dcc.Dropdown(
+                    id="form-metric",
+                    options=[{"label": metric, "value": metric} for metric in FORM_METRICS],
+                    value=FORM_METRICS[0],
+                    clearable=False
+                ), width=3),
+                dbc.Col(dcc.Input(id="form-window", type="number", min=1, max=MAX_WINDOW, step=1,
+                                  value=DEFAULT_WINDOW),
+                        width="auto"),
+                dbc.Col(html.Span("corridas na janela"), width="auto")
+            ], className="mb-2 align-items-center"),
+            dbc.Row([
+                dbc.Col(dcc.Dropdown(id="form-selection", multi=True, placeholder="Pilotos ou equipes"), width=12)
+            ], className="mb-3"),
+            html.Div(id="form-output")
+        ])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
+
+
+def form_detail_dash(kind, selection, metric, window):
+    """
+    Série temporal da métrica de forma para as entidades selecionadas.
+    """
+    import plotly.express as px
+    from dash import dcc, html
+    from f1_analysis.form import DEFAULT_WINDOW, MAX_WINDOW, RollingForm
+    from f1_analysis.registry import ENTITY_KINDS
+
+    try:
+        column = ENTITY_KINDS[kind][0]
+        # O limite do dcc.Input só vale no navegador; cada janela distinta fica
+        # em cache no RollingForm, então o valor é limitado aqui também
+        window = min(max(int(window or DEFAULT_WINDOW), 1), MAX_WINDOW)
+        form_df = RollingForm.get(kind, window=window)
+        form_df = form_df[form_df[column].isin(selection)]
+
+        fig = px.line(
+            form_df,
+            x="Data",
+            y=metric,
+            color="Nome",
+            hover_data=["Ano", "Rodada", "Pontos", "Chegada"],
+            title=f"{metric} ao Longo do Tempo",
+            labels={"Nome": "Pilotos" if kind == "driver" else "Equipes"}
+        )
+        if metric.startswith("Chegada"):
+            fig.update_yaxes(autorange="reversed")
+
+        return html.Div([dcc.Graph(figure=fig)])
+
+    except Exception as e:
+        return html.Div(f"Erro: {e}", style={"color": "red"})
 
 
-# Executar o servidor
+# Executar o servidor de desenvolvimento (produção: python -m f1_analysis.web.serve)
+# (sem o reloader do modo debug, que recarregaria os dados num segundo processo)
 if __name__ == "__main__":
-    app.run_server(debug=True)
+    app = create_app()
+    app.run(debug=True, use_reloader=False)
@@ -0,0 +1,65 @@
+"""
+Modo de produção do dashboard (em vez do servidor de desenvolvimento do Dash).
+
+    python -m f1_analysis.web.serve
+
+Configuração por variáveis de ambiente:
+
+    F1_HOST     endereço de escuta (padrão 0.0.0.0)
+    F1_PORT     porta (padrão 8050)
+    F1_WORKERS  processos do gunicorn (padrão 2)
+    F1_THREADS  threads por processo (padrão 8)
+
+Com o gunicorn instalado, sobe F1_WORKERS processos gthread com o app
+pré-carregado no mestre (preload_app), de modo que os dados são lidos uma
+única vez e compartilhados pelos workers. Sem gunicorn (ex.: Windows), usa o
+waitress: um processo com F1_THREADS threads. O endpoint /health/ready só
+responde 200 depois do warm-up.
+"""
+import os
+
+
+def serve(host=None, port=None, workers=None, threads=None):
+    """
+    Sobe o dashboard com um servidor WSGI de produção.
+    """
+    host = host or os.environ.get("F1_HOST", "0.0.0.0")
+    port = int(port or os.environ.get("F1_PORT", 8050))
+    workers = int(workers or os.environ.get("F1_WORKERS", 2))
+    threads = int(threads or os.environ.get("F1_THREADS", 8))
+
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is not None:
+        class GunicornApplication(BaseApplication):
+            def load_config(self):
+                self.cfg.set("bind", f"{host}:{port}")
+                self.cfg.set("workers", workers)
+                self.cfg.set("threads", threads)
+                self.cfg.set("worker_class", "gthread")
+                self.cfg.set("preload_app", True)
+
+            def load(self):
+                from f1_analysis.web.wsgi import server
+                return server
+
+        print(f"Servindo com gunicorn em {host}:{port} ({workers} workers x {threads} threads)")
+        GunicornApplication().run()
+        return
+
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        raise RuntimeError("Modo de produção requer gunicorn ou waitress: pip install gunicorn (ou waitress).")
+
+    from f1_analysis.web.wsgi import server
+
+    print(f"Servindo com waitress em {host}:{port} ({threads} threads)")
+    waitress_serve(server, host=host, port=port, threads=threads)
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,13 @@
+"""
+Ponto de entrada WSGI do dashboard para servidores de produção.
+
+    gunicorn --preload --workers 4 --threads 8 --worker-class gthread f1_analysis.web.wsgi:server
+
+Importar este módulo faz o warm-up completo (dados, índices e agregados);
+com --preload isso acontece uma vez no processo mestre e os workers herdam
+os DataFrames já carregados via fork.
+"""
+from f1_analysis.web.main import create_app
+
+app = create_app(preload=True)
+server = app.server